@@ -0,0 +1,30 @@
+"""Add updated_at to stock_assignments and production
+
+Revision ID: 1d6e9b4c7a30
+Revises: f3a85c6e2b17
+Create Date: 2026-10-18 14:08:31.640127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1d6e9b4c7a30'
+down_revision: Union[str, Sequence[str], None] = 'f3a85c6e2b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('stock_assignments', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('production', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('production', 'updated_at')
+    op.drop_column('stock_assignments', 'updated_at')
@@ -0,0 +1,47 @@
+"""Add production_forecasts and forecast_states
+
+Revision ID: 5a8e2f7c1b94
+Revises: 1d6e9b4c7a30
+Create Date: 2026-10-18 16:42:19.208533
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a8e2f7c1b94'
+down_revision: Union[str, Sequence[str], None] = '1d6e9b4c7a30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('forecast_states',
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('level', sa.Float(), nullable=False),
+    sa.Column('trend', sa.Float(), nullable=False),
+    sa.Column('weekday_profile', sa.JSON(), nullable=False),
+    sa.Column('through_date', sa.Date(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.PrimaryKeyConstraint('item_id')
+    )
+    op.create_table('production_forecasts',
+    sa.Column('forecast_date', sa.Date(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('expected', sa.Float(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.PrimaryKeyConstraint('forecast_date', 'item_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('production_forecasts')
+    op.drop_table('forecast_states')
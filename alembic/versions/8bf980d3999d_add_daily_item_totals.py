@@ -0,0 +1,46 @@
+"""Add daily_item_totals
+
+Revision ID: 8bf980d3999d
+Revises: 9b2f041ecf3d
+Create Date: 2026-10-18 09:12:40.118274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8bf980d3999d'
+down_revision: Union[str, Sequence[str], None] = '9b2f041ecf3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_item_totals',
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('produced_quantity', sa.Integer(), nullable=False),
+    sa.Column('assigned_quantity', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.PrimaryKeyConstraint('item_id', 'date')
+    )
+    # Backfill from the existing history, the services keep it current from here on
+    op.execute("""
+        INSERT INTO daily_item_totals (item_id, date, produced_quantity, assigned_quantity)
+        SELECT item_id, day, SUM(produced), SUM(assigned)
+        FROM (
+            SELECT item_id, production_date AS day, quantity AS produced, 0 AS assigned FROM production
+            UNION ALL
+            SELECT item_id, assignment_date AS day, 0 AS produced, quantity AS assigned FROM stock_assignments
+        ) AS movements
+        GROUP BY item_id, day
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_item_totals')
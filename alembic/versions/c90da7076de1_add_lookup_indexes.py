@@ -0,0 +1,48 @@
+"""Add composite indexes for the hot lookup predicates
+
+Revision ID: c90da7076de1
+Revises: 8bf980d3999d
+Create Date: 2026-10-18 10:03:17.552901
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c90da7076de1'
+down_revision: Union[str, Sequence[str], None] = '8bf980d3999d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_name', 'users', ['name'], unique=False)
+    op.create_index('ix_sales_rates_customer_item_effective_from', 'sales_rates', ['customer_id', 'item_id', 'effective_from'], unique=False)
+    op.create_index(
+        'ix_sales_rates_active_customer_item', 'sales_rates', ['customer_id', 'item_id', 'effective_from'], unique=False,
+        postgresql_where=sa.text('is_active'),
+        sqlite_where=sa.text('is_active')
+    )
+    op.create_index('ix_sales_rates_effective_from_id', 'sales_rates', ['effective_from', 'id'], unique=False)
+    op.create_index('ix_stock_assignments_assignment_date_id', 'stock_assignments', ['assignment_date', 'id'], unique=False)
+    op.create_index('ix_stock_assignments_customer_date_id', 'stock_assignments', ['customer_id', 'assignment_date', 'id'], unique=False)
+    op.create_index('ix_stock_assignments_item_date', 'stock_assignments', ['item_id', 'assignment_date'], unique=False)
+    op.create_index('ix_production_production_date_id', 'production', ['production_date', 'id'], unique=False)
+    op.create_index('ix_production_item_date', 'production', ['item_id', 'production_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_production_item_date', table_name='production')
+    op.drop_index('ix_production_production_date_id', table_name='production')
+    op.drop_index('ix_stock_assignments_item_date', table_name='stock_assignments')
+    op.drop_index('ix_stock_assignments_customer_date_id', table_name='stock_assignments')
+    op.drop_index('ix_stock_assignments_assignment_date_id', table_name='stock_assignments')
+    op.drop_index('ix_sales_rates_effective_from_id', table_name='sales_rates')
+    op.drop_index('ix_sales_rates_active_customer_item', table_name='sales_rates')
+    op.drop_index('ix_sales_rates_customer_item_effective_from', table_name='sales_rates')
+    op.drop_index('ix_users_name', table_name='users')
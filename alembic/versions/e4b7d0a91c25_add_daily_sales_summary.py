@@ -0,0 +1,51 @@
+"""Add daily_sales_summary and working_days.summarized_at
+
+Revision ID: e4b7d0a91c25
+Revises: c90da7076de1
+Create Date: 2026-10-18 11:26:05.394812
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7d0a91c25'
+down_revision: Union[str, Sequence[str], None] = 'c90da7076de1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_sales_summary',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.PrimaryKeyConstraint('date', 'customer_id', 'item_id')
+    )
+    op.create_index('ix_daily_sales_summary_customer_date', 'daily_sales_summary', ['customer_id', 'date'], unique=False)
+    op.add_column('working_days', sa.Column('summarized_at', sa.DateTime(timezone=True), nullable=True))
+    # Backfill the whole history, days that are already closed are final from here on
+    op.execute("""
+        INSERT INTO daily_sales_summary (date, customer_id, item_id, quantity, amount)
+        SELECT sa.assignment_date, sa.customer_id, sa.item_id,
+               SUM(sa.quantity), SUM(sa.quantity * COALESCE(sr.rate, 0))
+        FROM stock_assignments sa
+        LEFT OUTER JOIN sales_rates sr ON sr.id = sa.sales_rate_id
+        GROUP BY sa.assignment_date, sa.customer_id, sa.item_id
+    """)
+    op.execute("UPDATE working_days SET summarized_at = CURRENT_TIMESTAMP WHERE status = 'CLOSE'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('working_days', 'summarized_at')
+    op.drop_index('ix_daily_sales_summary_customer_date', table_name='daily_sales_summary')
+    op.drop_table('daily_sales_summary')
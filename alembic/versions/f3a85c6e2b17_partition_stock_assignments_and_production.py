@@ -0,0 +1,101 @@
+"""Partition stock_assignments and production by month
+
+Revision ID: f3a85c6e2b17
+Revises: e4b7d0a91c25
+Create Date: 2026-10-18 12:41:58.207316
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a85c6e2b17'
+down_revision: Union[str, Sequence[str], None] = 'e4b7d0a91c25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months created ahead of today, PartitionService keeps extending this
+MONTHS_AHEAD = 3
+
+# table -> (partition column, foreign keys, secondary indexes)
+PARTITIONED = {
+    'stock_assignments': (
+        'assignment_date',
+        [('customer_id', 'users'), ('item_id', 'items'), ('sales_rate_id', 'sales_rates'), ('created_by', 'users')],
+        [
+            ('ix_stock_assignments_id', ['id']),
+            ('ix_stock_assignments_assignment_date_id', ['assignment_date', 'id']),
+            ('ix_stock_assignments_customer_date_id', ['customer_id', 'assignment_date', 'id']),
+            ('ix_stock_assignments_item_date', ['item_id', 'assignment_date']),
+        ],
+    ),
+    'production': (
+        'production_date',
+        [('item_id', 'items'), ('created_by', 'users')],
+        [
+            ('ix_production_id', ['id']),
+            ('ix_production_production_date_id', ['production_date', 'id']),
+            ('ix_production_item_date', ['item_id', 'production_date']),
+        ],
+    ),
+}
+
+
+def _add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Recreate table as partitioned (or plain again) and move its rows over"""
+    column, foreign_keys, indexes = PARTITIONED[table]
+    old = f'{table}_old'
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    op.execute(f'ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey')
+    # Keep the id sequence alive when the old table is dropped
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY NONE')
+
+    if partitioned:
+        # Primary keys of partitioned tables must contain the partition column
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS, PRIMARY KEY (id, {column})) PARTITION BY RANGE ({column})')
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+        first_day = op.get_bind().execute(sa.text(f'SELECT min({column}) FROM {old}')).scalar()
+        this_month = date.today().replace(day=1)
+        month = min(first_day.replace(day=1), this_month) if first_day else this_month
+        while month <= _add_months(this_month, MONTHS_AHEAD):
+            op.execute(
+                f"CREATE TABLE {table}_p{month.year:04d}_{month.month:02d} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month}') TO ('{_add_months(month, 1)}')"
+            )
+            month = _add_months(month, 1)
+    else:
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS, PRIMARY KEY (id))')
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    op.execute(f'DROP TABLE {old} CASCADE')
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    for fk_column, referred in foreign_keys:
+        op.create_foreign_key(f'{table}_{fk_column}_fkey', table, referred, [fk_column], ['id'])
+    for name, columns in indexes:
+        op.create_index(name, table, columns, unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Declarative partitioning is PostgreSQL only, other databases keep plain tables
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in PARTITIONED:
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in PARTITIONED:
+        _rebuild(table, partitioned=False)
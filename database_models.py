@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Boolean, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Boolean, ForeignKey, Enum, Index, JSON, PrimaryKeyConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -21,7 +21,7 @@ class User(Base):
     __tablename__ = "users"
     
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(100), nullable=False)
+    name = Column(String(100), nullable=False, index=True)
     role = Column(Enum(UserRole), nullable=False, default=UserRole.CUSTOMER)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -53,11 +53,28 @@ class SalesRate(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Fetch server generated created_at/updated_at in the INSERT/UPDATE itself
+    __mapper_args__ = {"eager_defaults": True}
+    
     # Relationships
     customer = relationship("User", foreign_keys=[customer_id])
     item = relationship("Item")
     created_by_user = relationship("User", foreign_keys=[created_by])
     updated_by_user = relationship("User", foreign_keys=[updated_by])
+    
+    __table_args__ = (
+        # Rate history lookups and the reactivation query on delete
+        Index("ix_sales_rates_customer_item_effective_from", "customer_id", "item_id", "effective_from"),
+        # Active rate lookups (deactivation, resolver, get_active_rate_for_date)
+        Index(
+            "ix_sales_rates_active_customer_item",
+            "customer_id", "item_id", "effective_from",
+            postgresql_where=(is_active == True),
+            sqlite_where=(is_active == True)
+        ),
+        # Keyset pagination
+        Index("ix_sales_rates_effective_from_id", "effective_from", "id"),
+    )
 
 # Stock Assignments Table
 class StockAssignment(Base):
@@ -71,12 +88,21 @@ class StockAssignment(Base):
     sales_rate_id = Column(Integer, ForeignKey("sales_rates.id"), nullable=True)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True) 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     customer = relationship("User", foreign_keys=[customer_id])
     item = relationship("Item")
     sales_rate = relationship("SalesRate", foreign_keys=[sales_rate_id])
     created_by_user = relationship("User", foreign_keys=[created_by]) 
+    
+    __table_args__ = (
+        Index("ix_stock_assignments_assignment_date_id", "assignment_date", "id"),
+        Index("ix_stock_assignments_customer_date_id", "customer_id", "assignment_date", "id"),
+        Index("ix_stock_assignments_item_date", "item_id", "assignment_date"),
+        # Monthly RANGE partitions on PostgreSQL, see revision f3a85c6e2b17 and PartitionService
+        {"info": {"partition_by": "assignment_date"}},
+    )
 
 # Production Table
 class Production(Base):
@@ -89,10 +115,17 @@ class Production(Base):
     note = Column(String(500), nullable=True)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationship
     item = relationship("Item")
     created_by_user = relationship("User", foreign_keys=[created_by]) 
+    
+    __table_args__ = (
+        Index("ix_production_production_date_id", "production_date", "id"),
+        Index("ix_production_item_date", "item_id", "production_date"),
+        {"info": {"partition_by": "production_date"}},
+    )
 
 # Working Days Table
 class WorkingDay(Base):
@@ -104,6 +137,63 @@ class WorkingDay(Base):
     date = Column(Date, nullable=False, unique=True)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set once the day is closed and its daily_sales_summary rows are final
+    summarized_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
-    created_by_user = relationship("User", foreign_keys=[created_by])
\ No newline at end of file
+    created_by_user = relationship("User", foreign_keys=[created_by])
+
+class DailyItemTotal(Base):
+    """Produced and assigned quantity per item and day, kept current by the
+    production and stock assignment services in the same transaction as the write"""
+    __tablename__ = "daily_item_totals"
+    
+    item_id = Column(Integer, ForeignKey("items.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    produced_quantity = Column(Integer, nullable=False, default=0)
+    assigned_quantity = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        PrimaryKeyConstraint("item_id", "date"),
+    )
+
+class DailySalesSummary(Base):
+    """Quantity and revenue (quantity x bound rate) per day, customer and item,
+    filled by SalesSummaryService and final once the working day is closed"""
+    __tablename__ = "daily_sales_summary"
+    
+    date = Column(Date, nullable=False)
+    customer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    item_id = Column(Integer, ForeignKey("items.id"), nullable=False)
+    quantity = Column(Integer, nullable=False, default=0)
+    amount = Column(Float, nullable=False, default=0)
+    
+    __table_args__ = (
+        PrimaryKeyConstraint("date", "customer_id", "item_id"),
+        Index("ix_daily_sales_summary_customer_date", "customer_id", "date"),
+    )
+
+class ForecastState(Base):
+    """Smoothed demand model per item, fed by ForecastService one closed working day at a time"""
+    __tablename__ = "forecast_states"
+    
+    item_id = Column(Integer, ForeignKey("items.id"), primary_key=True)
+    level = Column(Float, nullable=False)
+    trend = Column(Float, nullable=False)
+    weekday_profile = Column(JSON, nullable=False)  # 7 additive offsets, Monday first
+    through_date = Column(Date, nullable=False)  # Last closed day folded into the state
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class ProductionForecast(Base):
+    """Quantity to bake per item for a working day, kept after the day for comparison with actuals"""
+    __tablename__ = "production_forecasts"
+    
+    forecast_date = Column(Date, nullable=False)
+    item_id = Column(Integer, ForeignKey("items.id"), nullable=False)
+    expected = Column(Float, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        PrimaryKeyConstraint("forecast_date", "item_id"),
+    )
@@ -2,22 +2,18 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from database import SessionLocal
+from database import get_db, get_async_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ):
-    """Dependency to get current user in any endpoint"""
+    """Dependency to get current user in any endpoint.
+
+    The session only opens a connection when the principal cache misses.
+    """
     from services.auth_service import AuthService
     auth_service = AuthService(db)
     return auth_service.get_current_user(token)
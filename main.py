@@ -1,6 +1,10 @@
+import time
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from database import engine
-import database_models
+from database import engine, async_engine
+from startup import run_startup
 
 # Import routers
 from routers.auth import router as auth_router
@@ -10,11 +14,24 @@ from routers.sales_rates import router as sales_rates_router
 from routers.stock_assignments import router as stock_assignments_router
 from routers.production import router as production_router
 from routers.working_days import router as working_days_router
+from routers.admin import router as admin_router
+from routers.reports import router as reports_router
+from routers.exports import router as exports_router
+from routers.metrics import router as metrics_router
+from routers.me import router as me_router
+from routers.analytics import router as analytics_router
+from utils.query_metrics import QueryMetricsMiddleware
 
-# Create tables
-database_models.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema is managed by alembic, startup only checks it (DB_CREATE_ALL=true for dev databases)
+    await run_startup(_import_started)
+    yield
+    await async_engine.dispose()
+    engine.dispose()
 
-app = FastAPI(title="Bakery Management System")
+app = FastAPI(title="Bakery Management System", lifespan=lifespan)
+app.add_middleware(QueryMetricsMiddleware)
 
 # Include all routers
 app.include_router(auth_router)
@@ -24,6 +41,12 @@ app.include_router(sales_rates_router)
 app.include_router(stock_assignments_router)
 app.include_router(production_router)
 app.include_router(working_days_router)
+app.include_router(admin_router)
+app.include_router(reports_router)
+app.include_router(exports_router)
+app.include_router(metrics_router)
+app.include_router(me_router)
+app.include_router(analytics_router)
 
 @app.get("/")
 def root():
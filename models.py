@@ -1,8 +1,10 @@
-from pydantic import BaseModel, ConfigDict, computed_field,field_validator, model_validator, ConfigDict, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field, computed_field,field_validator, model_validator, ConfigDict, EmailStr
+from typing import Optional, List, Generic, TypeVar
 from datetime import date, datetime
 import enum
 
+T = TypeVar("T")
+
 # Enums (redefine for Pydantic)
 class UserRole(str, enum.Enum):
     ADMIN = "admin"
@@ -83,6 +85,13 @@ class SalesRate(SalesRateBase):
     created_by_user: Optional[User] = None
     updated_by_user: Optional[User] = None
 
+class SalesRateSummary(SalesRateBase):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
 class SalesRateNonNested(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
@@ -96,6 +105,15 @@ class SalesRateNonNested(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
+class RateLookup(BaseModel):
+    customer_id: int
+    item_id: int
+    target_date: date
+
+class RateLookupResult(RateLookup):
+    sales_rate_id: Optional[int] = None
+    rate: Optional[float] = None
+
 # ========== Stock Assignment Schemas ==========
 class StockAssignmentBase(BaseModel):
     customer_id: int
@@ -107,6 +125,12 @@ class StockAssignmentBase(BaseModel):
 class StockAssignmentCreate(StockAssignmentBase):
     sales_rate_id: Optional[int] = None 
 
+class StockAssignmentBulkResult(BaseModel):
+    index: int  # Position of the line in the request
+    id: Optional[int] = None
+    sales_rate_id: Optional[int] = None
+    error: Optional[str] = None
+
 class StockAssignmentUpdate(BaseModel):
     quantity: Optional[int] = None
     rate: Optional[float] = None
@@ -158,6 +182,21 @@ class Production(ProductionBase):
     item: Optional[Item] = None
     created_by_user: Optional[User] = None 
 
+class ProductionForecastLine(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    forecast_date: date
+    item_id: int
+    item_name: str
+    expected: float
+    quantity: int  # expected rounded up
+
+class ProductionForecastRun(BaseModel):
+    through_date: Optional[date] = None  # Last closed day in the model
+    forecast_date: Optional[date] = None
+    days_processed: int
+    items: int
+
 # ========== Working Day Schemas ==========
 class WorkingDayBase(BaseModel):
     status: WorkingDayStatus = WorkingDayStatus.OPEN
@@ -178,8 +217,112 @@ class WorkingDay(WorkingDayBase):
     
     id: int
     created_at: datetime
+    summarized_at: Optional[datetime] = None
     created_by_user: Optional[User] = None  # ADDED
 
+class WorkingDayMonthCreate(BaseModel):
+    year: int = Field(ge=2000, le=2100)
+    month: int = Field(ge=1, le=12)
+    status: WorkingDayStatus = WorkingDayStatus.OPEN
+    non_working_weekdays: List[int] = []  # 0 = Monday ... 6 = Sunday, created with is_working False
+
+class WorkingDayCalendarEntry(BaseModel):
+    date: date
+    id: Optional[int] = None  # None when no working day exists for the date
+    status: Optional[WorkingDayStatus] = None
+    is_working: bool = False
+    is_open: bool = False
+
+# ========== Report Schemas ==========
+class ReconciliationLine(BaseModel):
+    date: date
+    item_id: int
+    item_name: str
+    produced_quantity: int
+    assigned_quantity: int
+    leftover_quantity: int
+
+class DailySalesLine(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    date: date
+    customer_id: int
+    item_id: int
+    quantity: int
+    amount: float
+
+class DailySalesRollup(BaseModel):
+    date_from: date
+    date_to: date
+    lines: int  # Summary rows written, frozen days are skipped
+
+# ========== Customer View Schemas ==========
+class CustomerDashboardLine(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    date: date
+    item_id: int
+    quantity: int
+    amount: float
+
+class CustomerCurrentRate(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    item_id: int
+    sales_rate_id: int
+    rate: float
+    effective_from: date
+    effective_to: Optional[date] = None
+
+class CustomerDashboard(BaseModel):
+    customer_id: int
+    date_from: date
+    date_to: date
+    lines: List[CustomerDashboardLine]
+    current_rates: List[CustomerCurrentRate]
+    total_quantity: int
+    total_amount: float
+
+# ========== Export Schemas ==========
+class ParquetExportRun(BaseModel):
+    dataset: str
+    full: bool
+    months: List[str]  # YYYY-MM of every rewritten file
+    rows: int
+    watermark: datetime
+
+class ParquetExportFile(BaseModel):
+    dataset: str
+    month: str
+    size_bytes: int
+    modified_at: datetime
+
+# ========== Analytics Schemas ==========
+class WeekdayDemand(BaseModel):
+    weekday: int  # 0 = Monday
+    mean_quantity: float
+    moving_average: float  # Mean of the last `window` occurrences of the weekday
+
+class ItemDemand(BaseModel):
+    item_id: int
+    item_name: str
+    produced_quantity: int
+    assigned_quantity: int
+    sell_through: Optional[float] = None  # assigned / produced, None without production
+    price_elasticity: Optional[float] = None  # None when sold at fewer than two prices
+    weekdays: List[WeekdayDemand]
+
+class DemandAnalytics(BaseModel):
+    date_from: date
+    date_to: date
+    window: int
+    items: List[ItemDemand]
+
+# ========== Pagination ==========
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= to fetch the next page
+
 # ========== Response with Relationships ==========
 class UserWithRelations(User):
     sales_rates: List[SalesRate] = []
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+from dependencies import require_admin
+from database import engine, async_engine
+from utils.pool_metrics import sync_pool_metrics, async_pool_metrics
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.get("/pool")
+def get_pool_stats(current_user = Depends(require_admin)):
+    """Connection pool checkout latency, usage and timeouts per engine"""
+    return {
+        "sync": sync_pool_metrics.snapshot(engine.pool),
+        "async": async_pool_metrics.snapshot(async_engine.sync_engine.pool),
+    }
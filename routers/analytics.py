@@ -0,0 +1,32 @@
+from datetime import date, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from dependencies import get_db, require_salesman_or_admin
+from services.analytics_service import AnalyticsService
+from models import DemandAnalytics
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+# Default history when ?from= is not given
+DEFAULT_HISTORY_DAYS = 730
+
+@router.get("/demand", response_model=DemandAnalytics)
+def get_demand(
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    window: int = Query(4, ge=1, le=52, description="Weeks in the per weekday moving average"),
+    item_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(require_salesman_or_admin)
+):
+    """Per item weekday demand, sell-through and price elasticity, by default over the last two years"""
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_HISTORY_DAYS)
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must not be before 'from'"
+        )
+    service = AnalyticsService(db)
+    return service.demand(date_from, date_to, window=window, item_id=item_id)
@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+from datetime import date
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from database import session_scope
+from dependencies import get_db, require_admin, require_salesman_or_admin
+from services.export_service import ExportService, STOCK_ASSIGNMENT_COLUMNS, PRODUCTION_COLUMNS
+from services.parquet_export_service import ParquetExportService
+from models import ParquetExportFile, ParquetExportRun
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+# Rows buffered per chunk written to the response
+CHUNK_ROWS = 500
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+def _json_default(value):
+    if isinstance(value, date):  # Also covers datetime
+        return value.isoformat()
+    return str(value)
+
+def _encode(rows, columns, export_format: str):
+    """Turn a row stream into text chunks, memory stays bounded by CHUNK_ROWS"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export_format == "csv" else None
+    if writer:
+        writer.writerow(columns)
+    
+    for count, row in enumerate(rows, start=1):
+        if writer:
+            writer.writerow([row[column] for column in columns])
+        else:
+            buffer.write(json.dumps({column: row[column] for column in columns}, default=_json_default))
+            buffer.write("\n")
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def _export(dataset: str, columns, export_format: str, date_from: Optional[date], date_to: Optional[date]):
+    if date_from is not None and date_to is not None and date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must not be before 'from'"
+        )
+    
+    def generate():
+        with session_scope() as db:
+            rows = getattr(ExportService(db), dataset.replace("-", "_"))(date_from, date_to)
+            yield from _encode(rows, columns, export_format)
+    
+    filename = f"{dataset}.{export_format}"
+    return StreamingResponse(
+        generate(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/stock-assignments")
+def export_stock_assignments(
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    current_user = Depends(require_salesman_or_admin)
+):
+    """Stock assignments with resolved rate and total_price, streamed as CSV or NDJSON"""
+    return _export("stock-assignments", STOCK_ASSIGNMENT_COLUMNS, export_format, date_from, date_to)
+
+@router.get("/production")
+def export_production(
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    current_user = Depends(require_salesman_or_admin)
+):
+    """Production records streamed as CSV or NDJSON"""
+    return _export("production", PRODUCTION_COLUMNS, export_format, date_from, date_to)
+
+@router.get("/parquet", response_model=list[ParquetExportFile])
+def list_parquet_exports(current_user = Depends(require_salesman_or_admin)):
+    """Monthly Parquet files available for download"""
+    return ParquetExportService(None).list_files()
+
+@router.post("/parquet/{dataset}", response_model=ParquetExportRun)
+def run_parquet_export(
+    dataset: Literal["stock_assignments", "production"],
+    full: bool = Query(False, description="Rewrite every month instead of the ones changed since the last run"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_admin)
+):
+    """Write the months of a dataset that changed since the last run as Parquet"""
+    return ParquetExportService(db).run(dataset, full=full)
+
+@router.get("/parquet/{dataset}/{month}")
+def download_parquet_export(
+    dataset: Literal["stock_assignments", "production"],
+    month: str,
+    current_user = Depends(require_salesman_or_admin)
+):
+    """One month of a dataset as a Parquet file, month is YYYY-MM"""
+    path = ParquetExportService(None).file_path(dataset, month)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return FileResponse(path, media_type="application/vnd.apache.parquet", filename=f"{dataset}-{month}.parquet")
@@ -1,24 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from dependencies import get_db, get_current_user
-from services.item_service import ItemService
+from dependencies import get_db, get_async_db, get_current_user
+from services.item_service import ItemService, AsyncItemService, EXPANDABLE
 from models import Item, ItemCreate, ItemUpdate
 from database_models import User
+from utils.expand import parse_expand
+from utils.http_cache import response_cache
 
 router = APIRouter(prefix="/items", tags=["items"])
 
 @router.get("/", response_model=list[Item])
-def get_items(db: Session = Depends(get_db)):
-    service = ItemService(db)
-    return service.get_all()
+async def get_items(
+    request: Request,
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = AsyncItemService(db)
+    expand_set = parse_expand(expand, EXPANDABLE)
+    return await response_cache.respond(
+        request, "items", list[Item],
+        lambda: service.get_all(expand=expand_set)
+    )
 
 @router.get("/{item_id}", response_model=Item)
-def get_item(item_id: int, db: Session = Depends(get_db)):
-    service = ItemService(db)
-    item = service.get_by_id(item_id)
-    if not item:
-        raise HTTPException(status_code=404, detail="Item not found")
-    return item
+async def get_item(
+    request: Request,
+    item_id: int,
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = AsyncItemService(db)
+    expand_set = parse_expand(expand, EXPANDABLE)
+    
+    async def load():
+        item = await service.get_by_id(item_id, expand=expand_set)
+        if not item:
+            raise HTTPException(status_code=404, detail="Item not found")
+        return item
+    
+    return await response_cache.respond(request, "items", Item, load)
 
 @router.post("/", response_model=Item, status_code=status.HTTP_201_CREATED)
 def create_item(
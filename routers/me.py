@@ -0,0 +1,72 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from dependencies import get_async_db, get_current_user
+from services.stock_assignment_service import AsyncStockAssignmentService, EXPANDABLE as ASSIGNMENT_EXPANDABLE
+from services.sales_rate_service import AsyncSalesRateService, EXPANDABLE as RATE_EXPANDABLE
+from services.customer_view_service import AsyncCustomerViewService, customer_namespace
+from models import CustomerDashboard, Page, SalesRate, StockAssignment, User
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.expand import parse_expand
+from utils.http_cache import response_cache
+
+# Everything here is scoped to the caller. The principal cache resolves them, so deleted users lose access
+router = APIRouter(prefix="/me", tags=["me"])
+
+@router.get("/stock-assignments", response_model=Page[StockAssignment])
+async def get_my_stock_assignments(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    item_id: Optional[int] = None,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = AsyncStockAssignmentService(db)
+    return await service.get_page(
+        limit=limit,
+        cursor=cursor,
+        customer_id=current_user.id,
+        item_id=item_id,
+        date_from=date_from,
+        date_to=date_to,
+        expand=parse_expand(expand, ASSIGNMENT_EXPANDABLE)
+    )
+
+@router.get("/sales-rates", response_model=Page[SalesRate])
+async def get_my_sales_rates(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    item_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = AsyncSalesRateService(db)
+    return await service.get_page(
+        limit=limit,
+        cursor=cursor,
+        customer_id=current_user.id,
+        item_id=item_id,
+        is_active=is_active,
+        expand=parse_expand(expand, RATE_EXPANDABLE)
+    )
+
+@router.get("/dashboard", response_model=CustomerDashboard)
+async def get_my_dashboard(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Last 30 days of assignments with the current rates, cached per customer until their data changes"""
+    today = date.today()
+    service = AsyncCustomerViewService(db)
+    return await response_cache.respond(
+        request, customer_namespace(current_user.id), CustomerDashboard,
+        lambda: service.dashboard(current_user.id, today),
+        vary=today.isoformat()
+    )
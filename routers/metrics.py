@@ -0,0 +1,23 @@
+import hmac
+import os
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+from dependencies import get_current_user, get_db, oauth2_scheme, require_admin
+from utils.query_metrics import route_metrics
+
+# Bearer token for the Prometheus scraper, admins can always use their own login token
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+router = APIRouter(tags=["metrics"])
+
+def require_metrics_access(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    """Route names and traffic are internal, only the scraper and admins may read them"""
+    if METRICS_TOKEN and hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+        return
+    require_admin(get_current_user(token, db))
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics(access = Depends(require_metrics_access)):
+    """Per route request and SQL query metrics in Prometheus text format"""
+    return PlainTextResponse(route_metrics.render(), media_type="text/plain; version=0.0.4")
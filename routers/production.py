@@ -1,21 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from dependencies import get_db, get_current_user
-from services.production_service import ProductionService
-from models import Production, ProductionCreate, ProductionUpdate
+from dependencies import get_db, get_async_db, get_current_user, require_admin, require_salesman_or_admin
+from services.production_service import ProductionService, AsyncProductionService, EXPANDABLE
+from services.forecast_service import ForecastService
+from models import Page, Production, ProductionCreate, ProductionForecastLine, ProductionForecastRun, ProductionUpdate
 from database_models import User
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.expand import parse_expand
 
 router = APIRouter(prefix="/production", tags=["production"])
 
-@router.get("/", response_model=list[Production])
-def get_production_records(db: Session = Depends(get_db)):
-    service = ProductionService(db)
-    return service.get_all()
+@router.get("/", response_model=Page[Production])
+async def get_production_records(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    item_id: Optional[int] = None,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = AsyncProductionService(db)
+    return await service.get_page(
+        limit=limit,
+        cursor=cursor,
+        item_id=item_id,
+        date_from=date_from,
+        date_to=date_to,
+        expand=parse_expand(expand, EXPANDABLE)
+    )
+
+@router.get("/forecast", response_model=list[ProductionForecastLine])
+def get_production_forecast(
+    forecast_date: Optional[date] = Query(None, alias="date"),
+    item_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(require_salesman_or_admin)
+):
+    """Quantity to bake per item, for ?date= or the next working day"""
+    service = ForecastService(db)
+    return service.get_forecast(forecast_date, item_id=item_id)
+
+@router.post("/forecast/run", response_model=ProductionForecastRun)
+def run_production_forecast(
+    full: bool = Query(False, description="Refit from the whole history instead of feeding new closed days"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_admin)
+):
+    service = ForecastService(db)
+    return service.run(full=full)
 
 @router.get("/{production_id}", response_model=Production)
-def get_production_record(production_id: int, db: Session = Depends(get_db)):
-    service = ProductionService(db)
-    production = service.get_by_id(production_id)
+async def get_production_record(
+    production_id: int,
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = AsyncProductionService(db)
+    production = await service.get_by_id(production_id, expand=parse_expand(expand, EXPANDABLE))
     if not production:
         raise HTTPException(status_code=404, detail="Production record not found")
     return production
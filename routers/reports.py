@@ -0,0 +1,122 @@
+import json
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from database import session_scope
+from dependencies import get_db, require_admin, require_salesman_or_admin
+from services.report_service import ReportService
+from services.sales_summary_service import SalesSummaryService
+from models import DailySalesLine, DailySalesRollup, ReconciliationLine
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+def _check_range(date_from: date, date_to: date):
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must not be before 'from'"
+        )
+
+def _stream_customer_statement(customer_id: int, date_from: date, date_to: date):
+    total_quantity = 0
+    total_amount = 0.0
+    yield '{"customer_id": %d, "from": "%s", "to": "%s", "lines": [' % (customer_id, date_from, date_to)
+    with session_scope() as db:
+        for index, row in enumerate(ReportService(db).customer_statement(customer_id, date_from, date_to)):
+            total_quantity += row.quantity
+            amount = float(row.amount)
+            total_amount += amount
+            line = {
+                "date": row.assignment_date.isoformat(),
+                "item_id": row.item_id,
+                "item_name": row.item_name,
+                "quantity": row.quantity,
+                "rate": row.rate,
+                "amount": amount,
+            }
+            yield ("," if index else "") + json.dumps(line)
+    yield '], "total_quantity": %s, "total_amount": %s}' % (json.dumps(total_quantity), json.dumps(total_amount))
+
+@router.get("/customer-statement")
+def get_customer_statement(
+    customer_id: int,
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    current_user = Depends(require_salesman_or_admin)
+):
+    """Quantity x rate per day and item for one customer, streamed as JSON"""
+    _check_range(date_from, date_to)
+    return StreamingResponse(
+        _stream_customer_statement(customer_id, date_from, date_to),
+        media_type="application/json"
+    )
+
+@router.get("/reconciliation", response_model=list[ReconciliationLine])
+def get_reconciliation(
+    day: Optional[date] = Query(None, alias="date"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    incremental: bool = False,
+    db: Session = Depends(get_db),
+    current_user = Depends(require_salesman_or_admin)
+):
+    """Produced vs assigned stock per item for ?date= or a ?from=&to= range.
+
+    With incremental=true the maintained daily totals are read instead of
+    aggregating production and stock assignments.
+    """
+    if day is not None:
+        date_from = date_to = day
+    if date_from is None or date_to is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Either 'date' or both 'from' and 'to' are required"
+        )
+    _check_range(date_from, date_to)
+    
+    service = ReportService(db)
+    if incremental:
+        rows = service.reconciliation_from_totals(date_from, date_to)
+    else:
+        rows = service.reconciliation(date_from, date_to)
+    return [
+        ReconciliationLine(
+            date=row.day,
+            item_id=row.item_id,
+            item_name=row.item_name,
+            produced_quantity=row.produced_quantity,
+            assigned_quantity=row.assigned_quantity,
+            leftover_quantity=row.produced_quantity - row.assigned_quantity
+        )
+        for row in rows
+    ]
+
+@router.get("/daily-sales", response_model=list[DailySalesLine])
+def get_daily_sales(
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    customer_id: Optional[int] = None,
+    item_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(require_salesman_or_admin)
+):
+    """Quantity and revenue per day, customer and item from the daily sales summary"""
+    _check_range(date_from, date_to)
+    service = SalesSummaryService(db)
+    return service.get_daily_sales(date_from, date_to, customer_id=customer_id, item_id=item_id)
+
+@router.post("/daily-sales/rollup", response_model=DailySalesRollup)
+def rollup_daily_sales(
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    force: bool = Query(False, description="Also recompute closed days that are already summarized"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_admin)
+):
+    """Refresh the daily sales summary for a range, closed days are only computed once"""
+    _check_range(date_from, date_to)
+    service = SalesSummaryService(db)
+    lines = service.rollup(date_from, date_to, force=force)
+    return DailySalesRollup(date_from=date_from, date_to=date_to, lines=lines)
@@ -1,21 +1,78 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from dependencies import get_db, get_current_user  # ADD get_current_user
-from services.sales_rate_service import SalesRateService
-from models import SalesRate, SalesRateCreate, SalesRateUpdate
+from dependencies import get_db, get_async_db, get_current_user  # ADD get_current_user
+from services.sales_rate_service import SalesRateService, AsyncSalesRateService, EXPANDABLE
+from services.rate_resolver import SalesRateResolver
+from models import Page, SalesRate, SalesRateCreate, SalesRateUpdate, SalesRateSummary, RateLookup, RateLookupResult
 from database_models import User  # ADD this import
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.expand import parse_expand
 
 router = APIRouter(prefix="/sales-rates", tags=["sales-rates"])
 
-@router.get("/", response_model=list[SalesRate])
-def get_sales_rates(db: Session = Depends(get_db)):
+@router.get("/", response_model=Page[SalesRate])
+async def get_sales_rates(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    customer_id: Optional[int] = None,
+    item_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Date filters apply to effective_from"""
+    service = AsyncSalesRateService(db)
+    return await service.get_page(
+        limit=limit,
+        cursor=cursor,
+        customer_id=customer_id,
+        item_id=item_id,
+        date_from=date_from,
+        date_to=date_to,
+        is_active=is_active,
+        expand=parse_expand(expand, EXPANDABLE)
+    )
+
+@router.post("/batch", response_model=list[SalesRateSummary], status_code=status.HTTP_201_CREATED)
+def create_sales_rates_batch(
+    rates: list[SalesRateCreate],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Apply a price list of new rates in one transaction"""
     service = SalesRateService(db)
-    return service.get_all()
+    return service.create_batch(rates, created_by_user_id=current_user.id, updated_by_user_id=current_user.id)
+
+@router.post("/resolve", response_model=list[RateLookupResult])
+def resolve_sales_rates(lookups: list[RateLookup], db: Session = Depends(get_db)):
+    """Resolve the active rate for many (customer, item, date) keys in one call"""
+    resolver = SalesRateResolver(db)
+    resolved = resolver.resolve_many(
+        (lookup.customer_id, lookup.item_id, lookup.target_date) for lookup in lookups
+    )
+    results = []
+    for lookup in lookups:
+        rate = resolved[(lookup.customer_id, lookup.item_id, lookup.target_date)]
+        results.append(RateLookupResult(
+            **lookup.model_dump(),
+            sales_rate_id=rate.id if rate else None,
+            rate=rate.rate if rate else None
+        ))
+    return results
 
 @router.get("/{rate_id}", response_model=SalesRate)
-def get_sales_rate(rate_id: int, db: Session = Depends(get_db)):
-    service = SalesRateService(db)
-    rate = service.get_by_id(rate_id)
+async def get_sales_rate(
+    rate_id: int,
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = AsyncSalesRateService(db)
+    rate = await service.get_by_id(rate_id, expand=parse_expand(expand, EXPANDABLE))
     if not rate:
         raise HTTPException(status_code=404, detail="Sales rate not found")
     return rate
@@ -1,21 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from dependencies import get_db, get_current_user
-from services.stock_assignment_service import StockAssignmentService
-from models import StockAssignment, StockAssignmentCreate, StockAssignmentUpdate
+from dependencies import get_db, get_async_db, get_current_user
+from services.stock_assignment_service import StockAssignmentService, AsyncStockAssignmentService, EXPANDABLE
+from models import Page, StockAssignment, StockAssignmentCreate, StockAssignmentUpdate, StockAssignmentBulkResult
 from database_models import User
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.expand import parse_expand
 
 router = APIRouter(prefix="/stock-assignments", tags=["stock-assignments"])
 
-@router.get("/", response_model=list[StockAssignment])
-def get_stock_assignments(db: Session = Depends(get_db)):
-    service = StockAssignmentService(db)
-    return service.get_all()
+@router.get("/", response_model=Page[StockAssignment])
+async def get_stock_assignments(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    customer_id: Optional[int] = None,
+    item_id: Optional[int] = None,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = AsyncStockAssignmentService(db)
+    return await service.get_page(
+        limit=limit,
+        cursor=cursor,
+        customer_id=customer_id,
+        item_id=item_id,
+        date_from=date_from,
+        date_to=date_to,
+        expand=parse_expand(expand, EXPANDABLE)
+    )
 
 @router.get("/{assignment_id}", response_model=StockAssignment)
-def get_stock_assignment(assignment_id: int, db: Session = Depends(get_db)):
-    service = StockAssignmentService(db)
-    assignment = service.get_by_id(assignment_id)
+async def get_stock_assignment(
+    assignment_id: int,
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = AsyncStockAssignmentService(db)
+    assignment = await service.get_by_id(assignment_id, expand=parse_expand(expand, EXPANDABLE))
     if not assignment:
         raise HTTPException(status_code=404, detail="Stock assignment not found")
     return assignment
@@ -30,6 +56,16 @@ def create_stock_assignment(
     # Pass the current user's ID as created_by
     return service.create(assignment, created_by_user_id=current_user.id)
 
+@router.post("/bulk", response_model=list[StockAssignmentBulkResult], status_code=status.HTTP_201_CREATED)
+def create_stock_assignments_bulk(
+    assignments: list[StockAssignmentCreate],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create many assignments at once, missing sales_rate_id is bound to the rate active on assignment_date"""
+    service = StockAssignmentService(db)
+    return service.create_bulk(assignments, created_by_user_id=current_user.id)
+
 @router.put("/{assignment_id}", response_model=StockAssignment)
 def update_stock_assignment(
     assignment_id: int, 
@@ -1,18 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from dependencies import get_db, get_current_user, require_admin
-from services.user_service import UserService
+from dependencies import get_db, get_async_db, get_current_user, require_admin
+from services.user_service import UserService, AsyncUserService
 from models import User, UserCreate, UserUpdate
+from utils.http_cache import response_cache
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/", response_model=list[User])
-def get_users(
-    db: Session = Depends(get_db),
+async def get_users(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(require_admin)  # Only admin can see all users
 ):
-    service = UserService(db)
-    return service.get_all()
+    service = AsyncUserService(db)
+    return await response_cache.respond(request, "users", list[User], service.get_all)
 
 @router.get("/me", response_model=User)
 def get_my_profile(current_user = Depends(get_current_user)):
@@ -20,9 +23,10 @@ def get_my_profile(current_user = Depends(get_current_user)):
     return current_user
 
 @router.get("/{user_id}", response_model=User)
-def get_user(
+async def get_user(
+    request: Request,
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
     # Users can see their own profile, admin can see anyone
@@ -32,11 +36,15 @@ def get_user(
             detail="Not authorized to view this user"
         )
     
-    service = UserService(db)
-    user = service.get_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user
+    service = AsyncUserService(db)
+    
+    async def load():
+        user = await service.get_by_id(user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        return user
+    
+    return await response_cache.respond(request, "users", User, load)
 
 @router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
 def create_user(
@@ -1,24 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from dependencies import get_db, get_current_user
-from services.working_day_service import WorkingDayService
-from models import WorkingDay, WorkingDayCreate, WorkingDayUpdate
+from dependencies import get_db, get_async_db, get_current_user
+from services.working_day_service import WorkingDayService, AsyncWorkingDayService, EXPANDABLE
+from models import WorkingDay, WorkingDayCreate, WorkingDayUpdate, WorkingDayMonthCreate, WorkingDayCalendarEntry
 from database_models import User
+from utils.expand import parse_expand
+from utils.http_cache import response_cache
 
 router = APIRouter(prefix="/working-days", tags=["working-days"])
 
 @router.get("/", response_model=list[WorkingDay])
-def get_working_days(db: Session = Depends(get_db)):
-    service = WorkingDayService(db)
-    return service.get_all()
+async def get_working_days(
+    request: Request,
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = AsyncWorkingDayService(db)
+    expand_set = parse_expand(expand, EXPANDABLE)
+    return await response_cache.respond(
+        request, "working-days", list[WorkingDay],
+        lambda: service.get_all(expand=expand_set)
+    )
+
+# Longest range /calendar answers in one call
+MAX_CALENDAR_DAYS = 366
+
+@router.get("/calendar", response_model=list[WorkingDayCalendarEntry])
+async def get_working_day_calendar(
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Status of every date in the range, served from the in-memory calendar"""
+    if date_to < date_from:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'to' must not be before 'from'")
+    if (date_to - date_from).days >= MAX_CALENDAR_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_CALENDAR_DAYS} days per request"
+        )
+    service = AsyncWorkingDayService(db)
+    return await service.get_calendar(date_from, date_to)
 
 @router.get("/{day_id}", response_model=WorkingDay)
-def get_working_day(day_id: int, db: Session = Depends(get_db)):
-    service = WorkingDayService(db)
-    day = service.get_by_id(day_id)
-    if not day:
-        raise HTTPException(status_code=404, detail="Working day not found")
-    return day
+async def get_working_day(
+    request: Request,
+    day_id: int,
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    service = AsyncWorkingDayService(db)
+    expand_set = parse_expand(expand, EXPANDABLE)
+    
+    async def load():
+        day = await service.get_by_id(day_id, expand=expand_set)
+        if not day:
+            raise HTTPException(status_code=404, detail="Working day not found")
+        return day
+    
+    return await response_cache.respond(request, "working-days", WorkingDay, load)
 
 @router.post("/", response_model=WorkingDay, status_code=status.HTTP_201_CREATED)
 def create_working_day(
@@ -30,6 +73,16 @@ def create_working_day(
     # Pass the current user's ID as created_by
     return service.create(day, created_by_user_id=current_user.id)
 
+@router.post("/bulk", response_model=list[WorkingDay], status_code=status.HTTP_201_CREATED)
+def create_working_days_for_month(
+    month: WorkingDayMonthCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create every missing working day of a month, existing dates are left as they are"""
+    service = WorkingDayService(db)
+    return service.create_month(month, created_by_user_id=current_user.id)
+
 @router.put("/{day_id}", response_model=WorkingDay)
 def update_working_day(day_id: int, day: WorkingDayUpdate, db: Session = Depends(get_db)):
     service = WorkingDayService(db)
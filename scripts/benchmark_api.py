@@ -0,0 +1,331 @@
+"""Latency and throughput benchmark of the API endpoints.
+
+Creates the tables with create_all and, unless --reuse is given, inserts a
+synthetic dataset (bench-admin and bench-salesman users, customers, items,
+multi-year sales rate histories, stock assignments, production, daily totals
+and working days) into a database that has no users yet; it is not removed
+afterwards. The app then runs in-process against the same DATABASE_URL,
+startup included, while concurrent clients call each endpoint, and p50/p95/p99
+latency and throughput are reported per endpoint. The scenarios only read,
+except --include-writes, which adds stock assignments on the last seeded day.
+
+    python scripts/benchmark_api.py --database-url sqlite:////tmp/bakery_bench.db --save-baseline
+    python scripts/benchmark_api.py --database-url sqlite:////tmp/bakery_bench.db --reuse --compare
+
+--compare exits non-zero when an endpoint's p95 regressed past --tolerance, so
+it can gate a release.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_api_baseline.json")
+SEED_CHUNK_SIZE = 5000
+
+def _chunked_insert(conn, table, rows):
+    from sqlalchemy import insert
+    for start in range(0, len(rows), SEED_CHUNK_SIZE):
+        conn.execute(insert(table), rows[start:start + SEED_CHUNK_SIZE])
+
+def seed(engine, customers: int, items: int, rate_periods: int, assignments: int, days: int, rng: random.Random):
+    """Insert the synthetic dataset, rows are generated here so it works on any dialect"""
+    from sqlalchemy import select
+    from database_models import (
+        DailyItemTotal, Item, Production, SalesRate, StockAssignment, User, UserRole,
+        WorkingDay, WorkingDayStatus,
+    )
+
+    today = date.today()
+    first_day = today - timedelta(days=days)
+    period_days = max(1, days // rate_periods)
+
+    with engine.begin() as conn:
+        _chunked_insert(conn, User.__table__, [
+            {"name": "bench-admin", "role": UserRole.ADMIN},
+            {"name": "bench-salesman", "role": UserRole.SALESMAN},
+        ] + [{"name": f"customer-{n}", "role": UserRole.CUSTOMER} for n in range(customers)])
+        admin_id = conn.execute(select(User.id).where(User.name == "bench-admin")).scalar_one()
+        customer_ids = conn.execute(select(User.id).where(User.role == UserRole.CUSTOMER)).scalars().all()
+
+        _chunked_insert(conn, Item.__table__, [{"name": f"item-{n}", "created_by": admin_id} for n in range(items)])
+        item_ids = conn.execute(select(Item.id)).scalars().all()
+
+        # Consecutive rate periods per customer x item, only the latest one is active
+        rate_rows = []
+        for customer_id in customer_ids:
+            for item_id in item_ids:
+                for period in range(rate_periods):
+                    is_last = period == rate_periods - 1
+                    rate_rows.append({
+                        "customer_id": customer_id,
+                        "item_id": item_id,
+                        "rate": round(rng.uniform(1, 10), 2),
+                        "effective_from": first_day + timedelta(days=period * period_days),
+                        "effective_to": None if is_last else first_day + timedelta(days=(period + 1) * period_days),
+                        "is_active": is_last,
+                        "created_by": admin_id,
+                    })
+        _chunked_insert(conn, SalesRate.__table__, rate_rows)
+        rate_ids = {}
+        for rate_id, customer_id, item_id, effective_from in conn.execute(
+            select(SalesRate.id, SalesRate.customer_id, SalesRate.item_id, SalesRate.effective_from)
+        ):
+            period = min((effective_from - first_day).days // period_days, rate_periods - 1)
+            rate_ids[(customer_id, item_id, period)] = rate_id
+
+        totals = {}
+        assignment_rows = []
+        for _ in range(assignments):
+            customer_id = rng.choice(customer_ids)
+            item_id = rng.choice(item_ids)
+            offset = rng.randrange(days + 1)
+            quantity = rng.randint(1, 50)
+            day = first_day + timedelta(days=offset)
+            assignment_rows.append({
+                "customer_id": customer_id,
+                "item_id": item_id,
+                "quantity": quantity,
+                "assignment_date": day,
+                "sales_rate_id": rate_ids[(customer_id, item_id, min(offset // period_days, rate_periods - 1))],
+                "created_by": admin_id,
+            })
+            totals.setdefault((item_id, day), [0, 0])[1] += quantity
+        _chunked_insert(conn, StockAssignment.__table__, assignment_rows)
+
+        production_rows = []
+        for item_id in item_ids:
+            for offset in range(days + 1):
+                day = first_day + timedelta(days=offset)
+                quantity = rng.randint(100, 500)
+                production_rows.append({"item_id": item_id, "quantity": quantity, "production_date": day, "created_by": admin_id})
+                totals.setdefault((item_id, day), [0, 0])[0] += quantity
+        _chunked_insert(conn, Production.__table__, production_rows)
+
+        _chunked_insert(conn, DailyItemTotal.__table__, [
+            {"item_id": item_id, "date": day, "produced_quantity": produced, "assigned_quantity": assigned}
+            for (item_id, day), (produced, assigned) in totals.items()
+        ])
+
+        _chunked_insert(conn, WorkingDay.__table__, [
+            {
+                "date": first_day + timedelta(days=offset),
+                "status": WorkingDayStatus.OPEN if offset == days else WorkingDayStatus.CLOSE,
+                "is_working": True,
+                "created_by": admin_id,
+            }
+            for offset in range(days + 1)
+        ])
+
+def load_fixtures(engine) -> dict:
+    """Ids and dates the scenarios pick their parameters from"""
+    from sqlalchemy import func, select
+    from database_models import Item, Production, SalesRate, StockAssignment, User, UserRole
+
+    with engine.connect() as conn:
+        last_day, first_day = conn.execute(
+            select(func.max(StockAssignment.assignment_date), func.min(StockAssignment.assignment_date))
+        ).one()
+        return {
+            "customers": conn.execute(select(User.id, User.name).where(User.role == UserRole.CUSTOMER)).all(),
+            "items": conn.execute(select(Item.id)).scalars().all(),
+            "sales_rates": conn.execute(select(SalesRate.id).order_by(SalesRate.id.desc()).limit(1000)).scalars().all(),
+            "assignments": conn.execute(select(StockAssignment.id).order_by(StockAssignment.id.desc()).limit(1000)).scalars().all(),
+            "production": conn.execute(select(Production.id).order_by(Production.id.desc()).limit(1000)).scalars().all(),
+            "first_day": first_day,
+            "last_day": last_day,
+        }
+
+def build_scenarios(fixtures: dict, rng: random.Random, include_writes: bool) -> dict:
+    """Endpoint name -> callable returning (method, url, json body) for one request"""
+    customers, items = fixtures["customers"], fixtures["items"]
+    span = (fixtures["last_day"] - fixtures["first_day"]).days
+
+    def some_day() -> date:
+        return fixtures["first_day"] + timedelta(days=rng.randrange(span + 1))
+
+    def month_range(param_from="from", param_to="to") -> str:
+        day = some_day()
+        return f"{param_from}={day - timedelta(days=30)}&{param_to}={day}"
+
+    scenarios = {
+        "POST /auth/login": lambda: ("POST", "/auth/login", {"name": rng.choice(customers).name}),
+        "GET /items/": lambda: ("GET", "/items/", None),
+        "GET /working-days/": lambda: ("GET", "/working-days/", None),
+        "GET /sales-rates/": lambda: ("GET", f"/sales-rates/?customer_id={rng.choice(customers).id}", None),
+        "GET /sales-rates/{id}": lambda: ("GET", f"/sales-rates/{rng.choice(fixtures['sales_rates'])}", None),
+        "POST /sales-rates/resolve": lambda: ("POST", "/sales-rates/resolve", [
+            {"customer_id": rng.choice(customers).id, "item_id": rng.choice(items), "target_date": str(some_day())}
+            for _ in range(20)
+        ]),
+        "GET /stock-assignments/": lambda: ("GET", f"/stock-assignments/?customer_id={rng.choice(customers).id}&{month_range()}", None),
+        "GET /stock-assignments/{id}": lambda: ("GET", f"/stock-assignments/{rng.choice(fixtures['assignments'])}", None),
+        "GET /production/": lambda: ("GET", f"/production/?item_id={rng.choice(items)}&{month_range()}", None),
+        "GET /production/{id}": lambda: ("GET", f"/production/{rng.choice(fixtures['production'])}", None),
+        "GET /reports/reconciliation": lambda: ("GET", f"/reports/reconciliation?date={some_day()}", None),
+        "GET /reports/customer-statement": lambda: (
+            "GET", f"/reports/customer-statement?customer_id={rng.choice(customers).id}&{month_range()}", None
+        ),
+        "GET /analytics/demand": lambda: (
+            "GET", f"/analytics/demand?from={fixtures['first_day']}&to={fixtures['last_day'] - timedelta(days=1)}", None
+        ),
+    }
+    if include_writes:
+        scenarios["POST /stock-assignments/"] = lambda: ("POST", "/stock-assignments/", {
+            "customer_id": rng.choice(customers).id,
+            "item_id": rng.choice(items),
+            "quantity": rng.randint(1, 50),
+            "assignment_date": str(fixtures["last_day"]),
+        })
+    return scenarios
+
+async def run_endpoint(client, headers: dict, make_request, requests: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            method, url, body = make_request()
+            start = time.perf_counter()
+            response = await client.request(method, url, json=body, headers=headers)
+            await response.aread()
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": len(latencies) / elapsed,
+        "mean_ms": statistics.fmean(latencies),
+        "p50_ms": cuts[49],
+        "p95_ms": cuts[94],
+        "p99_ms": cuts[98],
+    }
+
+async def run_benchmark(args, scenarios: dict) -> dict:
+    import httpx
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            login = await client.post("/auth/login", json={"name": "bench-admin"})
+            login.raise_for_status()
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+            results = {}
+            for name, make_request in scenarios.items():
+                if args.endpoint and not any(pattern in name for pattern in args.endpoint):
+                    continue
+                await run_endpoint(client, headers, make_request, args.warmup, args.concurrency)
+                results[name] = await run_endpoint(client, headers, make_request, args.requests, args.concurrency)
+                stats = results[name]
+                print(f"{name:<36}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+                      f"{stats['throughput_rps']:>10.1f}{stats['errors']:>8}")
+            return results
+
+def compare(results: dict, baseline: dict, tolerance: float) -> bool:
+    """Print p95 and throughput against the baseline, True when nothing regressed"""
+    passed = True
+    print(f"\n{'endpoint':<36}{'p95 base':>10}{'p95 now':>10}{'change':>9}{'rps change':>12}")
+    for name, stats in results.items():
+        base = baseline["endpoints"].get(name)
+        if base is None:
+            print(f"{name:<36}{'-':>10}{stats['p95_ms']:>10.2f}{'new':>9}")
+            continue
+        p95_change = stats["p95_ms"] / base["p95_ms"] - 1
+        rps_change = stats["throughput_rps"] / base["throughput_rps"] - 1
+        regressed = p95_change > tolerance
+        passed = passed and not regressed
+        print(f"{name:<36}{base['p95_ms']:>10.2f}{stats['p95_ms']:>10.2f}{p95_change:>+9.0%}{rps_change:>+12.0%}"
+              + ("  REGRESSED" if regressed else ""))
+    return passed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--customers", type=int, default=200)
+    parser.add_argument("--items", type=int, default=30)
+    parser.add_argument("--rate-periods", type=int, default=8, help="rate history entries per customer x item")
+    parser.add_argument("--assignments", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the dataset and request parameters")
+    parser.add_argument("--reuse", action="store_true", help="benchmark the data already in the database")
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--endpoint", action="append", help="only run endpoints containing this text, repeatable")
+    parser.add_argument("--include-writes", action="store_true", help="also benchmark POST /stock-assignments/")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="compare against the baseline and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative p95 increase, default 20%%")
+    args = parser.parse_args()
+
+    if not args.database_url or not args.database_url.startswith(("sqlite", "postgresql")):
+        parser.error("a SQLite or PostgreSQL --database-url (or DATABASE_URL) is required")
+
+    # The app reads DATABASE_URL when database.py is imported
+    os.environ["DATABASE_URL"] = args.database_url
+    from sqlalchemy import func, select
+    from database import Base, engine
+    from database_models import User
+
+    rng = random.Random(args.seed)
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        has_users = conn.execute(select(func.count(User.id))).scalar()
+    if not args.reuse:
+        if has_users:
+            parser.error("database already has users, use --reuse or an empty database")
+        start = time.perf_counter()
+        seed(engine, args.customers, args.items, args.rate_periods, args.assignments, args.days, rng)
+        print(f"seeded in {time.perf_counter() - start:.1f}s")
+    elif not has_users:
+        parser.error("--reuse needs a seeded database")
+
+    scenarios = build_scenarios(load_fixtures(engine), rng, args.include_writes)
+    print(f"\n{'endpoint':<36}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>10}{'errors':>8}")
+    results = asyncio.run(run_benchmark(args, scenarios))
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "meta": {
+                    "database": engine.dialect.name,
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "concurrency": args.concurrency,
+                    "requests": args.requests,
+                    "created": date.today().isoformat(),
+                },
+                "endpoints": results,
+            }, f, indent=2)
+        print(f"\nbaseline written to {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            parser.error(f"no baseline at {args.baseline}, run with --save-baseline first")
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Create, list and archive the monthly partitions of stock_assignments and production.
+
+Only does something on PostgreSQL after revision f3a85c6e2b17 has been applied.
+
+    python scripts/manage_partitions.py list
+    python scripts/manage_partitions.py ensure --months-ahead 6
+    python scripts/manage_partitions.py archive --before 2024-01-01 --schema archive
+    python scripts/manage_partitions.py archive --before 2022-01-01 --drop
+"""
+import argparse
+import os
+import sys
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import session_scope
+from services.partition_service import PARTITION_MONTHS_AHEAD, PartitionService, partitioned_tables
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="show the partitions with their estimated row counts")
+    ensure = commands.add_parser("ensure", help="create missing partitions up to some months ahead")
+    ensure.add_argument("--months-ahead", type=int, default=PARTITION_MONTHS_AHEAD)
+    archive = commands.add_parser("archive", help="detach partitions that end on or before a date")
+    archive.add_argument("--before", type=date.fromisoformat, required=True, help="cutoff date, YYYY-MM-DD")
+    target = archive.add_mutually_exclusive_group()
+    target.add_argument("--schema", default="archive", help="schema the detached partitions move to")
+    target.add_argument("--drop", action="store_true", help="drop detached partitions instead of keeping them")
+    args = parser.parse_args()
+
+    with session_scope() as db:
+        service = PartitionService(db)
+        if args.command == "list":
+            for table in partitioned_tables():
+                partitions = service.list_partitions(table)
+                if not partitions:
+                    print(f"{table}: not partitioned")
+                for partition in partitions:
+                    print(f"{table:<20}{partition.name:<36}{partition.rows:>12}")
+        elif args.command == "ensure":
+            created = service.ensure_partitions(months_ahead=args.months_ahead)
+            db.commit()
+            print("\n".join(created) or "nothing to create")
+        else:
+            archived = service.archive_before(args.before, schema=args.schema, drop=args.drop)
+            db.commit()
+            print("\n".join(archived) or "nothing to archive")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import os
+from datetime import date, timedelta
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+import database_models
+from utils.cache import TTLCache
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:  # Only needed for /analytics
+    np = pd = None
+
+# Upper bound on how long a cached result can outlive a change the key does not see
+ANALYTICS_CACHE_TTL_SECONDS = float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "3600"))
+
+analytics_cache = TTLCache(ttl_seconds=ANALYTICS_CACHE_TTL_SECONDS, max_entries=256)
+
+def load_columns(db: Session, stmt, columns) -> "pd.DataFrame":
+    """Run stmt on the Core connection and build a DataFrame column by column,
+    without ORM rows or per-row dicts"""
+    rows = db.connection().execute(stmt).all()
+    data = list(zip(*rows)) if rows else [()] * len(columns)
+    return pd.DataFrame({name: np.asarray(values) for name, values in zip(columns, data)})
+
+class AnalyticsService:
+    """Demand analytics per item over daily_item_totals and the rated stock assignments"""
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def demand(self, date_from: date, date_to: date, window: int = 4, item_id: Optional[int] = None):
+        """Per weekday averages, sell-through and price elasticity for every item.
+
+        Results of ranges where every date is a closed working day are cached.
+        The key is read from the database, the latest summarized_at of the range
+        and the latest sales rate change, so a day closed again or a rate
+        changed on any worker makes older entries unreachable. Item names are
+        added per request and never cached.
+        """
+        if np is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Analytics need the numpy and pandas packages"
+            )
+        
+        version = self._closed_range_version(date_from, date_to)
+        key = (date_from, date_to, window, item_id, version)
+        result = analytics_cache.get(key) if version is not None else None
+        if result is None:
+            result = self._compute(date_from, date_to, window, item_id)
+            if version is not None:
+                analytics_cache.set(key, result)
+        
+        names = dict(self.db.connection().execute(select(database_models.Item.id, database_models.Item.name)).all())
+        return {
+            **result,
+            "items": [{**item, "item_name": names.get(item["item_id"], "")} for item in result["items"]],
+        }
+    
+    def _closed_range_version(self, date_from: date, date_to: date):
+        """What the result of a fully closed range depends on, None when a date is not closed"""
+        day = database_models.WorkingDay
+        days, closed, summarized_at = self.db.execute(
+            select(
+                func.count(day.id),
+                func.count(case((day.status == database_models.WorkingDayStatus.CLOSE, 1))),
+                func.max(day.summarized_at),
+            ).where(day.date.between(date_from, date_to))
+        ).one()
+        if days != (date_to - date_from).days + 1 or closed != days:
+            return None
+        
+        rate = database_models.SalesRate
+        rates, rates_changed_at = self.db.execute(
+            select(func.count(rate.id), func.max(func.coalesce(rate.updated_at, rate.created_at)))
+        ).one()
+        return summarized_at, rates, rates_changed_at
+    
+    def _compute(self, date_from: date, date_to: date, window: int, item_id: Optional[int]):
+        totals = database_models.DailyItemTotal
+        stmt = select(totals.item_id, totals.date, totals.produced_quantity, totals.assigned_quantity)\
+            .where(
+                totals.date.between(date_from, date_to),
+                (totals.produced_quantity != 0) | (totals.assigned_quantity != 0)
+            )
+        if item_id is not None:
+            stmt = stmt.where(totals.item_id == item_id)
+        daily = load_columns(self.db, stmt, ("item_id", "date", "produced", "assigned"))
+        
+        # Mean quantity per assignment line at each price of an item, the elasticity observations
+        assignment = database_models.StockAssignment
+        rate = database_models.SalesRate
+        stmt = select(assignment.item_id, rate.rate, func.avg(assignment.quantity))\
+            .join(rate, rate.id == assignment.sales_rate_id)\
+            .where(assignment.assignment_date.between(date_from, date_to))\
+            .group_by(assignment.item_id, rate.rate)
+        if item_id is not None:
+            stmt = stmt.where(assignment.item_id == item_id)
+        priced = load_columns(self.db, stmt, ("item_id", "rate", "quantity"))
+        
+        items = []
+        if not daily.empty:
+            # Day numbers since 1970-01-01, a Thursday, give the weekday with Monday = 0
+            daily["weekday"] = (daily["date"].to_numpy(dtype="datetime64[D]").astype("int64") + 3) % 7
+            daily = daily.sort_values(["item_id", "date"])
+            by_weekday = daily.groupby(["item_id", "weekday"])["assigned"]
+            weekday_mean = by_weekday.mean()
+            # Moving average of the last `window` occurrences of each weekday
+            weekday_recent = daily.groupby(["item_id", "weekday"]).tail(window)\
+                .groupby(["item_id", "weekday"])["assigned"].mean()
+            sums = daily.groupby("item_id")[["produced", "assigned"]].sum()
+            elasticity = self._elasticity(priced)
+            
+            for current_item, row in sums.iterrows():
+                produced, assigned = int(row["produced"]), int(row["assigned"])
+                weekdays = weekday_mean.loc[current_item]
+                items.append({
+                    "item_id": int(current_item),
+                    "produced_quantity": produced,
+                    "assigned_quantity": assigned,
+                    "sell_through": assigned / produced if produced else None,
+                    "price_elasticity": elasticity.get(current_item),
+                    "weekdays": [
+                        {
+                            "weekday": int(weekday),
+                            "mean_quantity": float(mean),
+                            "moving_average": float(weekday_recent.loc[(current_item, weekday)]),
+                        }
+                        for weekday, mean in weekdays.items()
+                    ],
+                })
+        
+        return {"date_from": date_from, "date_to": date_to, "window": window, "items": items}
+    
+    @staticmethod
+    def _elasticity(priced: "pd.DataFrame") -> dict:
+        """Slope of log(quantity) over log(rate) per item, least squares over grouped sums.
+
+        Items sold at fewer than two distinct prices have no elasticity.
+        """
+        priced = priced[(priced["rate"] > 0) & (priced["quantity"] > 0)]
+        if priced.empty:
+            return {}
+        x = np.log(priced["rate"].astype(float))
+        y = np.log(priced["quantity"].astype(float))
+        sums = pd.DataFrame({"item_id": priced["item_id"], "x": x, "y": y, "xx": x * x, "xy": x * y})\
+            .groupby("item_id").agg(n=("x", "size"), x=("x", "sum"), y=("y", "sum"), xx=("xx", "sum"), xy=("xy", "sum"))
+        denominator = sums["n"] * sums["xx"] - sums["x"] ** 2
+        slope = (sums["n"] * sums["xy"] - sums["x"] * sums["y"]) / denominator.where(denominator > 1e-12)
+        return {int(item): float(value) for item, value in slope.dropna().items()}
@@ -6,6 +6,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 import database_models
 from models import TokenData, User
+from utils.cache import TTLCache
 import os
 from dotenv import load_dotenv
 
@@ -14,6 +15,10 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "86400"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "300"))
+
+# Authenticated users by id, invalidated by UserService.update/delete
+principal_cache = TTLCache(ttl_seconds=PRINCIPAL_CACHE_TTL_SECONDS, max_entries=10000)
 
 class AuthService:
     def __init__(self, db: Session):
@@ -59,9 +64,13 @@ class AuthService:
             raise credentials_exception
     
     def get_current_user(self, token: str) -> User:
-        """Get current user from token"""
+        """Get current user from token, served from the principal cache when possible"""
         token_data = self.verify_token(token)
         
+        principal = principal_cache.get(token_data.user_id)
+        if principal is not None:
+            return principal
+        
         user = self.db.query(database_models.User).filter(
             database_models.User.id == token_data.user_id
         ).first()
@@ -73,4 +82,6 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        return user
\ No newline at end of file
+        principal = User.model_validate(user)
+        principal_cache.set(principal.id, principal)
+        return principal
\ No newline at end of file
@@ -0,0 +1,75 @@
+from datetime import date, timedelta
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+import database_models
+from utils.http_cache import response_cache
+
+# Days of stock assignments shown on the customer dashboard
+DASHBOARD_DAYS = 30
+
+def customer_namespace(customer_id: int) -> str:
+    return f"customer-view:{customer_id}"
+
+def invalidate_customer_views(*customer_ids: int):
+    """Drop the cached /me views of customers whose assignments or rates changed"""
+    response_cache.invalidate(*[customer_namespace(customer_id) for customer_id in set(customer_ids)])
+
+class AsyncCustomerViewService:
+    """Per customer dashboard, computed on a miss and cached by the /me router"""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def dashboard(self, customer_id: int, today: date):
+        assignment = database_models.StockAssignment
+        rate = database_models.SalesRate
+        date_from = today - timedelta(days=DASHBOARD_DAYS - 1)
+        
+        # Served by ix_stock_assignments_customer_date_id
+        lines = (await self.db.execute(
+            select(
+                assignment.assignment_date.label("date"),
+                assignment.item_id,
+                func.sum(assignment.quantity).label("quantity"),
+                func.sum(assignment.quantity * func.coalesce(rate.rate, 0)).label("amount"),
+            )
+            .outerjoin(rate, rate.id == assignment.sales_rate_id)
+            .where(
+                assignment.customer_id == customer_id,
+                assignment.assignment_date.between(date_from, today)
+            )
+            .group_by(assignment.assignment_date, assignment.item_id)
+            .order_by(assignment.assignment_date.desc(), assignment.item_id)
+        )).all()
+        
+        # Served by the partial ix_sales_rates_active_customer_item
+        current_rates = (await self.db.execute(
+            select(
+                rate.item_id,
+                rate.id.label("sales_rate_id"),
+                rate.rate,
+                rate.effective_from,
+                rate.effective_to,
+            )
+            .where(
+                rate.customer_id == customer_id,
+                rate.is_active == True,
+                rate.effective_from <= today,
+                or_(rate.effective_to.is_(None), rate.effective_to >= today)
+            )
+            .order_by(rate.item_id, rate.effective_from.desc())
+        )).all()
+        
+        # Latest rate per item wins, like SalesRateService.get_active_rate_for_date
+        rates_by_item = {}
+        for row in current_rates:
+            rates_by_item.setdefault(row.item_id, row)
+        
+        return {
+            "customer_id": customer_id,
+            "date_from": date_from,
+            "date_to": today,
+            "lines": lines,
+            "current_rates": list(rates_by_item.values()),
+            "total_quantity": sum(line.quantity for line in lines),
+            "total_amount": float(sum(line.amount for line in lines)),
+        }
@@ -0,0 +1,88 @@
+from datetime import date
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased
+import database_models
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 2000
+
+STOCK_ASSIGNMENT_COLUMNS = (
+    "id", "assignment_date", "customer_id", "customer_name", "item_id", "item_name",
+    "quantity", "sales_rate_id", "rate", "total_price", "created_by", "created_at", "updated_at",
+)
+PRODUCTION_COLUMNS = (
+    "id", "production_date", "item_id", "item_name", "quantity", "note", "created_by", "created_at", "updated_at",
+)
+
+class ExportService:
+    """Flat row streams for exports, read through a server-side cursor without building ORM objects"""
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def _stream(self, stmt):
+        return self.db.execute(stmt.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE))
+    
+    def stream_partitions(self, stmt):
+        """Rows of stmt in lists of up to EXPORT_BATCH_SIZE, for columnar writers"""
+        return self._stream(stmt).partitions()
+    
+    def stock_assignments(self, date_from: Optional[date] = None, date_to: Optional[date] = None):
+        for row in self._stream(self.stock_assignment_statement(date_from, date_to)):
+            values = row._asdict()
+            # Same rule as the StockAssignment.total_price computed field
+            values["total_price"] = row.quantity * row.rate if row.rate is not None else 0.0
+            yield values
+    
+    def production(self, date_from: Optional[date] = None, date_to: Optional[date] = None):
+        for row in self._stream(self.production_statement(date_from, date_to)):
+            yield row._asdict()
+    
+    def stock_assignment_statement(self, date_from: Optional[date] = None, date_to: Optional[date] = None):
+        assignment = database_models.StockAssignment
+        rate = database_models.SalesRate
+        customer = aliased(database_models.User)
+        stmt = select(
+                assignment.id,
+                assignment.assignment_date,
+                assignment.customer_id,
+                customer.name.label("customer_name"),
+                assignment.item_id,
+                database_models.Item.name.label("item_name"),
+                assignment.quantity,
+                assignment.sales_rate_id,
+                rate.rate,
+                assignment.created_by,
+                assignment.created_at,
+                assignment.updated_at,
+            )\
+            .join(customer, customer.id == assignment.customer_id)\
+            .join(database_models.Item, database_models.Item.id == assignment.item_id)\
+            .outerjoin(rate, rate.id == assignment.sales_rate_id)\
+            .order_by(assignment.assignment_date, assignment.id)
+        if date_from is not None:
+            stmt = stmt.where(assignment.assignment_date >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(assignment.assignment_date <= date_to)
+        return stmt
+    
+    def production_statement(self, date_from: Optional[date] = None, date_to: Optional[date] = None):
+        production = database_models.Production
+        stmt = select(
+                production.id,
+                production.production_date,
+                production.item_id,
+                database_models.Item.name.label("item_name"),
+                production.quantity,
+                production.note,
+                production.created_by,
+                production.created_at,
+                production.updated_at,
+            )\
+            .join(database_models.Item, database_models.Item.id == production.item_id)\
+            .order_by(production.production_date, production.id)
+        if date_from is not None:
+            stmt = stmt.where(production.production_date >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(production.production_date <= date_to)
+        return stmt
@@ -0,0 +1,197 @@
+import os
+from datetime import date, timedelta
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, insert, select, true
+from sqlalchemy.orm import Session
+import database_models
+from services.analytics_service import load_columns, np, pd
+from utils.locks import advisory_xact_lock
+
+# Smoothing weights of the level, the trend and the weekday profile
+FORECAST_ALPHA = float(os.getenv("FORECAST_ALPHA", "0.2"))
+FORECAST_BETA = float(os.getenv("FORECAST_BETA", "0.05"))
+FORECAST_GAMMA = float(os.getenv("FORECAST_GAMMA", "0.3"))
+
+class ForecastService:
+    """Per item production forecast for the next working day.
+
+    Demand is the assigned quantity of each closed working day, smoothed into a
+    level, a trend and an additive weekday profile (Holt-Winters) for every
+    item at once. The model state is stored in forecast_states, so closing a
+    day only feeds that day instead of refitting the history. Days are fed in
+    date order up to the first working day that is still open; a day closed
+    again after it was fed needs a full run to be picked up.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+
+    def run(self, full: bool = False) -> dict:
+        """Update (or with full, refit from the whole history) as its own transaction"""
+        if np is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Forecasts need the numpy and pandas packages"
+            )
+        result = self.update(full=full)
+        self.db.commit()
+        return result
+
+    def update(self, full: bool = False) -> Optional[dict]:
+        """Feed the closed days not yet in the state and store the next forecast, without committing.
+
+        Returns None when numpy is missing, so closing a day never depends on it.
+        """
+        if np is None:
+            return None
+
+        state = database_models.ForecastState
+        # One update at a time, the state is read after a concurrent close has committed
+        advisory_xact_lock(self.db, "production-forecast")
+        if full:
+            self.db.execute(delete(state))
+        rows = [] if full else self.db.execute(
+            select(state.item_id, state.level, state.trend, state.weekday_profile, state.through_date)
+        ).all()
+        item_ids = [row.item_id for row in rows]
+        level = np.array([row.level for row in rows], dtype=float)
+        trend = np.array([row.trend for row in rows], dtype=float)
+        profile = np.array([row.weekday_profile for row in rows], dtype=float).reshape(len(rows), 7)
+        through = max((row.through_date for row in rows), default=None)
+
+        days, next_day = self._days_to_feed(through)
+        if days:
+            totals = database_models.DailyItemTotal
+            daily = load_columns(
+                self.db,
+                select(totals.item_id, totals.date, totals.produced_quantity, totals.assigned_quantity)
+                .where(totals.date.between(days[0], days[-1])),
+                ("item_id", "date", "produced", "assigned")
+            )
+            # Dates in the range that are not closed working days are left out
+            row_index = pd.Index(days).get_indexer(daily["date"])
+            daily = daily[row_index >= 0]
+            row_index = row_index[row_index >= 0]
+
+            # Items seen for the first time get a row of their own
+            new_items = sorted(set(daily["item_id"].tolist()) - set(item_ids))
+            item_ids += new_items
+            level = np.concatenate([level, np.zeros(len(new_items))])
+            trend = np.concatenate([trend, np.zeros(len(new_items))])
+            profile = np.vstack([profile, np.zeros((len(new_items), 7))])
+            initialized = np.arange(len(item_ids)) < len(rows)
+
+            # Day x item matrices of demand, censoring and presence
+            shape = (len(days), len(item_ids))
+            column_index = pd.Index(item_ids).get_indexer(daily["item_id"])
+            produced = daily["produced"].to_numpy()
+            assigned = np.zeros(shape)
+            assigned[row_index, column_index] = daily["assigned"].to_numpy(dtype=float)
+            # Sold out days only tell that demand was at least the assigned quantity
+            sold_out = np.zeros(shape, dtype=bool)
+            sold_out[row_index, column_index] = (produced > 0) & (daily["assigned"].to_numpy() >= produced)
+            observed = np.zeros(shape, dtype=bool)
+            observed[row_index, column_index] = True
+
+            for index, day in enumerate(days):
+                weekday = day.weekday()
+                demand, seen = assigned[index], observed[index]
+                first = seen & ~initialized
+                level[first] = demand[first]
+                initialized |= first
+
+                feed = seen & ~first
+                seasonal = profile[:, weekday]
+                expected = level + trend + seasonal
+                demand = np.where(sold_out[index], np.maximum(demand, expected), demand)
+                new_level = FORECAST_ALPHA * (demand - seasonal) + (1 - FORECAST_ALPHA) * (level + trend)
+                new_trend = FORECAST_BETA * (new_level - level) + (1 - FORECAST_BETA) * trend
+                profile[:, weekday] = np.where(feed, FORECAST_GAMMA * (demand - new_level) + (1 - FORECAST_GAMMA) * seasonal, seasonal)
+                level = np.where(feed, new_level, level)
+                trend = np.where(feed, new_trend, trend)
+
+            through = days[-1]
+            self._save_state(item_ids, level, trend, profile, through)
+
+        if through is None:
+            return {"through_date": None, "forecast_date": None, "days_processed": 0, "items": 0}
+
+        forecast_date = next_day or through + timedelta(days=1)
+        expected = np.maximum(level + trend + profile[:, forecast_date.weekday()], 0)
+        self._save_forecast(forecast_date, item_ids, expected)
+        return {
+            "through_date": through,
+            "forecast_date": forecast_date,
+            "days_processed": len(days),
+            "items": len(item_ids),
+        }
+
+    def _days_to_feed(self, through: Optional[date]):
+        """Closed working days after through, up to the first working day still open, and that open day"""
+        day = database_models.WorkingDay
+        after = day.date > through if through else true()
+        next_day = self.db.scalar(
+            select(func.min(day.date)).where(
+                after,
+                day.status == database_models.WorkingDayStatus.OPEN,
+                day.is_working == True
+            )
+        )
+        stmt = select(day.date).where(
+            after,
+            day.status == database_models.WorkingDayStatus.CLOSE,
+            day.is_working == True
+        ).order_by(day.date)
+        if next_day:
+            stmt = stmt.where(day.date < next_day)
+        return self.db.scalars(stmt).all(), next_day
+
+    def _save_state(self, item_ids, level, trend, profile, through: date):
+        state = database_models.ForecastState
+        self.db.execute(delete(state))
+        if not item_ids:
+            return
+        self.db.execute(insert(state), [
+            {
+                "item_id": int(item_id),
+                "level": float(item_level),
+                "trend": float(item_trend),
+                "weekday_profile": [float(value) for value in item_profile],
+                "through_date": through,
+            }
+            for item_id, item_level, item_trend, item_profile in zip(item_ids, level, trend, profile)
+        ])
+
+    def _save_forecast(self, forecast_date: date, item_ids, expected):
+        forecast = database_models.ProductionForecast
+        self.db.execute(delete(forecast).where(forecast.forecast_date == forecast_date))
+        if item_ids:
+            self.db.execute(insert(forecast), [
+                {
+                    "forecast_date": forecast_date,
+                    "item_id": int(item_id),
+                    "expected": float(value),
+                    "quantity": int(np.ceil(value)),
+                }
+                for item_id, value in zip(item_ids, expected)
+            ])
+
+    def get_forecast(self, forecast_date: Optional[date] = None, item_id: Optional[int] = None):
+        """Stored forecast lines of a date, the latest forecast when no date is given"""
+        forecast = database_models.ProductionForecast
+        if forecast_date is None:
+            forecast_date = self.db.scalar(select(func.max(forecast.forecast_date)))
+            if forecast_date is None:
+                return []
+        stmt = select(
+                forecast.forecast_date,
+                forecast.item_id,
+                database_models.Item.name.label("item_name"),
+                forecast.expected,
+                forecast.quantity,
+            )\
+            .join(database_models.Item, database_models.Item.id == forecast.item_id)\
+            .where(forecast.forecast_date == forecast_date)
+        if item_id is not None:
+            stmt = stmt.where(forecast.item_id == item_id)
+        return self.db.execute(stmt.order_by(forecast.item_id)).all()
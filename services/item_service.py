@@ -1,7 +1,14 @@
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 import database_models
 from models import ItemCreate, ItemUpdate
-from typing import Optional
+from typing import Optional, Set
+from utils.orm import attach_related
+from utils.expand import relationship_options
+from utils.http_cache import response_cache
+
+EXPANDABLE = ("created_by_user",)
 
 class ItemService:
     def __init__(self, db: Session):
@@ -24,14 +31,18 @@ class ItemService:
         if created_by_user_id:
             item_dict['created_by'] = created_by_user_id
         
-        item = database_models.Item(**item_dict)
-        self.db.add(item)
+        item = self.db.scalars(
+            insert(database_models.Item).returning(database_models.Item),
+            [item_dict]
+        ).one()
         self.db.commit()
-        self.db.refresh(item)
+        response_cache.invalidate("items")
         
-        # Load relationships for response
-        item = self.get_by_id(item.id)
-        return item
+        # Relationships for the response come from the identity map, not a reload
+        return attach_related(
+            self.db, item,
+            created_by_user=(database_models.User, item.created_by)
+        )
     
     def update(self, item_id: int, item_data: ItemUpdate):
         item = self.get_by_id(item_id)
@@ -43,7 +54,7 @@ class ItemService:
             setattr(item, field, value)
         
         self.db.commit()
-        self.db.refresh(item)
+        response_cache.invalidate("items")
         return item
     
     def delete(self, item_id: int):
@@ -53,6 +64,26 @@ class ItemService:
         
         self.db.delete(item)
         self.db.commit()
+        response_cache.invalidate("items")
         return True
+
+class AsyncItemService:
+    """Read side of ItemService on an AsyncSession"""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_all(self, expand: Optional[Set[str]] = None):
+        result = await self.db.scalars(
+            select(database_models.Item)
+            .options(*relationship_options(database_models.Item, EXPANDABLE, expand))
+        )
+        return result.all()
     
-    
\ No newline at end of file
+    async def get_by_id(self, item_id: int, expand: Optional[Set[str]] = None):
+        result = await self.db.scalars(
+            select(database_models.Item)
+            .options(*relationship_options(database_models.Item, EXPANDABLE, expand))
+            .where(database_models.Item.id == item_id)
+        )
+        return result.first()
+
@@ -0,0 +1,45 @@
+from collections import defaultdict
+from datetime import date
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+import database_models
+
+class ItemTotalsService:
+    """Incremental maintenance of daily_item_totals.
+
+    Deltas are only staged on the session, callers commit them together with
+    the production or stock assignment write that caused them.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+        self._deltas = defaultdict(lambda: [0, 0])
+    
+    def add(self, item_id: int, day: date, produced: int = 0, assigned: int = 0):
+        delta = self._deltas[(item_id, day)]
+        delta[0] += produced
+        delta[1] += assigned
+        return self
+    
+    def flush(self):
+        """Upsert all staged deltas with a single INSERT ... ON CONFLICT DO UPDATE"""
+        rows = [
+            {"item_id": item_id, "date": day, "produced_quantity": produced, "assigned_quantity": assigned}
+            for (item_id, day), (produced, assigned) in self._deltas.items()
+            if produced or assigned
+        ]
+        self._deltas.clear()
+        if not rows:
+            return
+        
+        dialect = self.db.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        totals = database_models.DailyItemTotal
+        stmt = insert(totals).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[totals.item_id, totals.date],
+            set_={
+                "produced_quantity": totals.produced_quantity + stmt.excluded.produced_quantity,
+                "assigned_quantity": totals.assigned_quantity + stmt.excluded.assigned_quantity,
+            }
+        )
+        self.db.execute(stmt)
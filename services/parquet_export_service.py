@@ -0,0 +1,229 @@
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+from fastapi import HTTPException, status
+from sqlalchemy import select, union
+from sqlalchemy.orm import Session
+import database_models
+from services.export_service import ExportService
+from services.partition_service import add_months, month_start
+from utils.locks import advisory_xact_lock
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # Only needed for the Parquet exports
+    pa = None
+
+EXPORT_DIR = os.getenv("EXPORT_DIR", "exports")
+# Incremental runs look this far behind the last watermark, rows of transactions
+# still open at the previous run are picked up; rewriting a month twice is harmless
+EXPORT_WATERMARK_OVERLAP_SECONDS = int(os.getenv("EXPORT_WATERMARK_OVERLAP_SECONDS", "300"))
+
+PARQUET_DATASETS = ("stock_assignments", "production")
+MONTH_PATTERN = re.compile(r"\d{4}-\d{2}")
+
+_run_locks = {dataset: threading.Lock() for dataset in PARQUET_DATASETS}
+
+def _schema(dataset: str):
+    timestamp = pa.timestamp("us", tz="UTC")
+    if dataset == "stock_assignments":
+        return pa.schema([
+            ("id", pa.int64()),
+            ("assignment_date", pa.date32()),
+            ("customer_id", pa.int64()),
+            ("customer_name", pa.string()),
+            ("item_id", pa.int64()),
+            ("item_name", pa.string()),
+            ("quantity", pa.int64()),
+            ("sales_rate_id", pa.int64()),
+            ("rate", pa.float64()),
+            ("created_by", pa.int64()),
+            ("created_at", timestamp),
+            ("updated_at", timestamp),
+        ])
+    return pa.schema([
+        ("id", pa.int64()),
+        ("production_date", pa.date32()),
+        ("item_id", pa.int64()),
+        ("item_name", pa.string()),
+        ("quantity", pa.int64()),
+        ("note", pa.string()),
+        ("created_by", pa.int64()),
+        ("created_at", timestamp),
+        ("updated_at", timestamp),
+    ])
+
+class ParquetExportService:
+    """Monthly Parquet files of the stock assignment and production history.
+
+    Files live at EXPORT_DIR/<dataset>/month=YYYY-MM/part.parquet, a layout
+    pyarrow.dataset and pandas read as one hive-partitioned table. Rows are
+    streamed from a server-side cursor in Arrow record batches. Incremental runs
+    rewrite only the months with rows created or updated since the last run.
+    Deletes alone, and renamed customers or items, are not detected that way;
+    a full run picks them up. Runs of a dataset are serialized across workers
+    with an advisory lock, and every file is written under a unique temp name.
+    """
+    def __init__(self, db: Session, export_dir: str = EXPORT_DIR):
+        self.db = db
+        self.export_dir = export_dir
+
+    def run(self, dataset: str, full: bool = False) -> dict:
+        if pa is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Parquet exports need the pyarrow package"
+            )
+        lock = _run_locks[dataset]
+        if not lock.acquire(blocking=False):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"A {dataset} export is already running"
+            )
+        try:
+            if not advisory_xact_lock(self.db, f"parquet-export:{dataset}", wait=False):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"A {dataset} export is already running"
+                )
+            started_at = datetime.now(timezone.utc)
+            watermark = None if full else self._read_watermark(dataset)
+            months = self._changed_months(dataset, watermark)
+            rows = sum(self._write_month(dataset, month) for month in months)
+            if watermark is None:
+                self._remove_stale_months(dataset, {month.strftime("%Y-%m") for month in months})
+            self._write_watermark(dataset, started_at)
+            return {
+                "dataset": dataset,
+                "full": watermark is None,
+                "months": [month.strftime("%Y-%m") for month in months],
+                "rows": rows,
+                "watermark": started_at,
+            }
+        finally:
+            # Ends the read-only transaction, which releases the advisory lock
+            self.db.rollback()
+            lock.release()
+
+    def list_files(self) -> List[dict]:
+        files = []
+        for dataset in PARQUET_DATASETS:
+            dataset_dir = os.path.join(self.export_dir, dataset)
+            if not os.path.isdir(dataset_dir):
+                continue
+            for entry in sorted(os.listdir(dataset_dir)):
+                month = entry.removeprefix("month=")
+                path = os.path.join(dataset_dir, entry, "part.parquet")
+                if entry.startswith("month=") and os.path.isfile(path):
+                    stat = os.stat(path)
+                    files.append({
+                        "dataset": dataset,
+                        "month": month,
+                        "size_bytes": stat.st_size,
+                        "modified_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+                    })
+        return files
+
+    def file_path(self, dataset: str, month: str) -> Optional[str]:
+        if dataset not in PARQUET_DATASETS or not MONTH_PATTERN.fullmatch(month):
+            return None
+        path = self._month_path(dataset, month)
+        return path if os.path.isfile(path) else None
+
+    def _month_path(self, dataset: str, month: str) -> str:
+        return os.path.join(self.export_dir, dataset, f"month={month}", "part.parquet")
+
+    def _changed_months(self, dataset: str, watermark: Optional[datetime]) -> List[date]:
+        if dataset == "stock_assignments":
+            model, date_column = database_models.StockAssignment, database_models.StockAssignment.assignment_date
+        else:
+            model, date_column = database_models.Production, database_models.Production.production_date
+
+        stmt = select(date_column).distinct()
+        if watermark is not None:
+            since = watermark - timedelta(seconds=EXPORT_WATERMARK_OVERLAP_SECONDS)
+            stmt = stmt.where((model.created_at > since) | (model.updated_at > since))
+            if dataset == "stock_assignments":
+                # A changed rate changes the exported rate of every line bound to it
+                rate = database_models.SalesRate
+                stmt = union(
+                    stmt,
+                    select(date_column)
+                    .join(rate, rate.id == model.sales_rate_id)
+                    .where(rate.updated_at > since)
+                )
+        return sorted({month_start(day) for day in self.db.scalars(stmt)})
+
+    def _write_month(self, dataset: str, month: date) -> int:
+        """Rewrite one month's file from the database, returns its row count"""
+        export = ExportService(self.db)
+        last_day = add_months(month, 1) - timedelta(days=1)
+        if dataset == "stock_assignments":
+            stmt = export.stock_assignment_statement(month, last_day)
+        else:
+            stmt = export.production_statement(month, last_day)
+
+        schema = _schema(dataset)
+        with_total = dataset == "stock_assignments"
+        file_schema = schema.append(pa.field("total_price", pa.float64())) if with_total else schema
+        path = self._month_path(dataset, month.strftime("%Y-%m"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique per writer, two runs never write into the same temp file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix="part.", suffix=".tmp")
+        os.close(fd)
+        rows = 0
+        try:
+            with pq.ParquetWriter(tmp_path, file_schema) as writer:
+                for partition in export.stream_partitions(stmt):
+                    columns = [pa.array(values, type=field.type) for values, field in zip(zip(*partition), schema)]
+                    if with_total:
+                        # Same rule as the StockAssignment.total_price computed field
+                        quantity, rate = columns[schema.get_field_index("quantity")], columns[schema.get_field_index("rate")]
+                        columns.append(pc.if_else(pc.is_null(rate), 0.0, pc.multiply(pc.cast(quantity, pa.float64()), rate)))
+                    writer.write_batch(pa.RecordBatch.from_arrays(columns, schema=file_schema))
+                    rows += len(partition)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        if rows:
+            os.chmod(tmp_path, 0o644)  # mkstemp files are owner-only
+            os.replace(tmp_path, path)
+        else:
+            # Everything in the month was deleted
+            os.remove(tmp_path)
+            if os.path.exists(path):
+                os.remove(path)
+        return rows
+
+    def _remove_stale_months(self, dataset: str, current: set):
+        """After a full run, drop the files of months that no longer have rows"""
+        for entry in self.list_files():
+            if entry["dataset"] == dataset and entry["month"] not in current:
+                path = self._month_path(dataset, entry["month"])
+                os.remove(path)
+                os.rmdir(os.path.dirname(path))
+    
+    def _watermark_path(self, dataset: str) -> str:
+        return os.path.join(self.export_dir, dataset, "_watermark.json")
+
+    def _read_watermark(self, dataset: str) -> Optional[datetime]:
+        try:
+            with open(self._watermark_path(dataset)) as f:
+                return datetime.fromisoformat(json.load(f)["watermark"])
+        except FileNotFoundError:
+            return None
+
+    def _write_watermark(self, dataset: str, watermark: datetime):
+        path = self._watermark_path(dataset)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix="_watermark.", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"watermark": watermark.isoformat()}, f)
+        os.replace(tmp_path, path)
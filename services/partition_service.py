@@ -0,0 +1,141 @@
+import re
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import database_models
+from utils.locks import advisory_xact_lock
+
+# Future months kept ready so inserts never fall into the DEFAULT partition
+PARTITION_MONTHS_AHEAD = 3
+
+_PARTITION_NAME = re.compile(r"_p(\d{4})_(\d{2})$")
+_IDENTIFIER = re.compile(r"[a-z_][a-z0-9_]*")
+
+class Partition(NamedTuple):
+    name: str
+    month: Optional[date]  # None for the DEFAULT partition
+    rows: int
+
+def partitioned_tables() -> Dict[str, str]:
+    """Table name -> partition column, from the table info set in database_models"""
+    return {
+        table.name: table.info["partition_by"]
+        for table in database_models.Base.metadata.sorted_tables
+        if "partition_by" in table.info
+    }
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+def add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+class PartitionService:
+    """Monthly RANGE partitions of stock_assignments and production on PostgreSQL.
+
+    The partitioned layout is created by the alembic migration; on SQLite, or
+    on a database where the tables are still plain, every method is a no-op.
+    Callers commit, like ItemTotalsService. Changes hold an advisory lock until
+    that commit, so workers starting together do not create the same partition.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _partitioned(self, table: str) -> bool:
+        if self.db.get_bind().dialect.name != "postgresql":
+            return False
+        return bool(self.db.execute(
+            text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+            {"table": table}
+        ).scalar())
+
+    def list_partitions(self, table: str) -> List[Partition]:
+        if not self._partitioned(table):
+            return []
+        rows = self.db.execute(text("""
+            SELECT child.relname, child.reltuples::bigint
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(:table)
+            ORDER BY child.relname
+        """), {"table": table}).all()
+        partitions = []
+        for name, estimated_rows in rows:
+            match = _PARTITION_NAME.search(name)
+            month = date(int(match.group(1)), int(match.group(2)), 1) if match else None
+            partitions.append(Partition(name, month, max(estimated_rows, 0)))
+        return partitions
+
+    def ensure_partitions(self, through: Optional[date] = None, months_ahead: int = PARTITION_MONTHS_AHEAD) -> List[str]:
+        """Create every missing monthly partition from this month up to through (or months_ahead)"""
+        this_month = month_start(date.today())
+        last_month = month_start(through) if through else add_months(this_month, months_ahead)
+        created = []
+        # Existing partitions are read after the lock, a concurrent run has committed by then
+        advisory_xact_lock(self.db, "partitions")
+        for table, column in partitioned_tables().items():
+            if not self._partitioned(table):
+                continue
+            existing = {partition.month for partition in self.list_partitions(table)}
+            month = min(this_month, last_month)
+            while month <= last_month:
+                if month not in existing:
+                    self._create_partition(table, column, month)
+                    created.append(partition_name(table, month))
+                month = add_months(month, 1)
+        return created
+
+    def _create_partition(self, table: str, column: str, month: date):
+        name = partition_name(table, month)
+        bounds = {"start": month, "end": add_months(month, 1)}
+        default = f"{table}_default"
+        stray_rows = self.db.execute(
+            text(f"SELECT 1 FROM {default} WHERE {column} >= :start AND {column} < :end LIMIT 1"),
+            bounds
+        ).scalar()
+        if not stray_rows:
+            self.db.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+            ))
+            return
+
+        # Rows of that month already landed in DEFAULT, move them into the new partition
+        self.db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+        self.db.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+        ))
+        self.db.execute(text(
+            f"INSERT INTO {table} SELECT * FROM {default} WHERE {column} >= :start AND {column} < :end"
+        ), bounds)
+        self.db.execute(text(f"DELETE FROM {default} WHERE {column} >= :start AND {column} < :end"), bounds)
+        self.db.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+
+    def archive_before(self, cutoff: date, schema: Optional[str] = "archive", drop: bool = False) -> List[str]:
+        """Detach the monthly partitions that end on or before cutoff.
+
+        Detached partitions are moved to schema, where they stay queryable
+        outside the app, or dropped when drop is set.
+        """
+        if not drop and not _IDENTIFIER.fullmatch(schema or ""):
+            raise ValueError(f"Invalid archive schema name {schema!r}")
+        archived = []
+        advisory_xact_lock(self.db, "partitions")
+        for table in partitioned_tables():
+            for partition in self.list_partitions(table):
+                if partition.month is None or add_months(partition.month, 1) > cutoff:
+                    continue
+                self.db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition.name}"))
+                if drop:
+                    self.db.execute(text(f"DROP TABLE {partition.name}"))
+                else:
+                    self.db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+                    self.db.execute(text(f"ALTER TABLE {partition.name} SET SCHEMA {schema}"))
+                archived.append(partition.name)
+        return archived
@@ -1,43 +1,94 @@
-from sqlalchemy.orm import Session, selectinload
+from datetime import date
+from typing import Optional, Set
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 import database_models
 from models import ProductionCreate, ProductionUpdate
+from utils.pagination import DEFAULT_PAGE_SIZE, apply_keyset, build_page
+from services.item_totals_service import ItemTotalsService
+from services.working_day_calendar import insert_on_open_days, open_for_write, working_day_calendar
+from utils.orm import attach_related
+from utils.expand import relationship_options
+
+EXPANDABLE = ("item", "created_by_user")
+
+def _load_options(expand: Optional[Set[str]] = None):
+    return relationship_options(
+        database_models.Production,
+        EXPANDABLE,
+        expand,
+        nested={"item": (database_models.Item.created_by_user,)}
+    )
+
+def _page_statement(limit, cursor, item_id, date_from, date_to, expand):
+    stmt = select(database_models.Production).options(*_load_options(expand))
+    
+    if item_id is not None:
+        stmt = stmt.where(database_models.Production.item_id == item_id)
+    if date_from is not None:
+        stmt = stmt.where(database_models.Production.production_date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(database_models.Production.production_date <= date_to)
+    
+    return apply_keyset(
+        stmt,
+        database_models.Production.production_date,
+        database_models.Production.id,
+        cursor,
+        limit
+    )
+
+def _by_id_statement(production_id: int, expand: Optional[Set[str]] = None):
+    return select(database_models.Production)\
+        .options(*_load_options(expand))\
+        .where(database_models.Production.id == production_id)
 
 class ProductionService:
     def __init__(self, db: Session):
         self.db = db
     
-    def get_all(self):
-        return self.db.query(database_models.Production)\
-            .options(
-                selectinload(database_models.Production.item),
-                selectinload(database_models.Production.created_by_user)  # ADDED
-            )\
-            .all()
-    
-    def get_by_id(self, production_id: int):
-        return self.db.query(database_models.Production)\
-            .options(
-                selectinload(database_models.Production.item),
-                selectinload(database_models.Production.created_by_user)  # ADDED
-            )\
-            .filter(database_models.Production.id == production_id)\
-            .first()
+    def get_page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        item_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        expand: Optional[Set[str]] = None,
+    ):
+        stmt = _page_statement(limit, cursor, item_id, date_from, date_to, expand)
+        return build_page(self.db.scalars(stmt).all(), limit, "production_date")
+    
+    def get_by_id(self, production_id: int, expand: Optional[Set[str]] = None):
+        return self.db.scalars(_by_id_statement(production_id, expand)).first()
     
     def create(self, production_data: ProductionCreate, created_by_user_id: Optional[int] = None):
+        working_day_calendar.ensure_writable(self.db, production_data.production_date)
+        
         # Set created_by if provided
         production_dict = production_data.model_dump()
         if created_by_user_id:
             production_dict['created_by'] = created_by_user_id
         
-        production = database_models.Production(**production_dict)
-        self.db.add(production)
+        # The closed-day check is part of the INSERT, nothing is read in front of it
+        production = insert_on_open_days(
+            self.db, database_models.Production, "production_date", [production_dict]
+        )[0]
+        if production is None:
+            working_day_calendar.reject_write(self.db, production_data.production_date)
+        ItemTotalsService(self.db)\
+            .add(production.item_id, production.production_date, produced=production.quantity)\
+            .flush()
         self.db.commit()
-        self.db.refresh(production)
         
-        # Load relationships for response
-        production = self.get_by_id(production.id)
-        return production
+        # Relationships for the response come from the identity map, not a reload
+        return attach_related(
+            self.db, production,
+            item=(database_models.Item, production.item_id),
+            created_by_user=(database_models.User, production.created_by)
+        )
     
     def update(self, production_id: int, production_data: ProductionUpdate):
         production = self.get_by_id(production_id)
@@ -45,11 +96,28 @@ class ProductionService:
             return None
         
         update_data = production_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(production, field, value)
+        days = (production.production_date, update_data.get("production_date", production.production_date))
+        working_day_calendar.ensure_writable(self.db, *days)
+        if not update_data:
+            return production
         
+        totals = ItemTotalsService(self.db)
+        totals.add(production.item_id, production.production_date, produced=-production.quantity)
+        
+        # Both the current and the new date must be open when the UPDATE runs
+        result = self.db.execute(
+            update(database_models.Production)
+            .where(
+                database_models.Production.id == production_id,
+                open_for_write(database_models.Production.production_date, days[1])
+            )
+            .values(**update_data)
+        )
+        if result.rowcount == 0:
+            working_day_calendar.reject_write(self.db, *days)
+        
+        totals.add(production.item_id, production.production_date, produced=production.quantity).flush()
         self.db.commit()
-        self.db.refresh(production)
         return production
     
     def delete(self, production_id: int):
@@ -57,6 +125,40 @@ class ProductionService:
         if not production:
             return False
         
-        self.db.delete(production)
+        working_day_calendar.ensure_writable(self.db, production.production_date)
+        
+        result = self.db.execute(
+            delete(database_models.Production)
+            .where(
+                database_models.Production.id == production_id,
+                open_for_write(database_models.Production.production_date)
+            )
+        )
+        if result.rowcount == 0:
+            working_day_calendar.reject_write(self.db, production.production_date)
+        
+        ItemTotalsService(self.db)\
+            .add(production.item_id, production.production_date, produced=-production.quantity)\
+            .flush()
         self.db.commit()
-        return True
\ No newline at end of file
+        return True
+
+class AsyncProductionService:
+    """Read side of ProductionService on an AsyncSession"""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        item_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        expand: Optional[Set[str]] = None,
+    ):
+        stmt = _page_statement(limit, cursor, item_id, date_from, date_to, expand)
+        return build_page((await self.db.scalars(stmt)).all(), limit, "production_date")
+    
+    async def get_by_id(self, production_id: int, expand: Optional[Set[str]] = None):
+        return (await self.db.scalars(_by_id_statement(production_id, expand))).first()
@@ -0,0 +1,160 @@
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import os
+import threading
+import time
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+import database_models
+
+RateKey = Tuple[int, int, date]  # (customer_id, item_id, date)
+
+# Upper bound on how long another worker's rate changes can go unseen
+RATE_CACHE_TTL_SECONDS = float(os.getenv("RATE_CACHE_TTL_SECONDS", "300"))
+
+class ResolvedRate(NamedTuple):
+    id: int
+    rate: float
+    effective_from: date
+    effective_to: Optional[date]
+
+class RateHistory:
+    """Rate intervals of one customer, indexed per item and sorted by effective_from"""
+
+    def __init__(self, rows: Iterable = ()):
+        self._rates: Dict[int, List[ResolvedRate]] = {}
+        for row in sorted(rows, key=lambda r: (r.item_id, r.effective_from, r.id)):
+            self._rates.setdefault(row.item_id, []).append(
+                ResolvedRate(row.id, row.rate, row.effective_from, row.effective_to)
+            )
+        self._starts = {
+            item_id: [rate.effective_from for rate in rates]
+            for item_id, rates in self._rates.items()
+        }
+        self.loaded_at = time.monotonic()
+
+    def lookup(self, item_id: int, target_date: date) -> Optional[ResolvedRate]:
+        starts = self._starts.get(item_id)
+        if not starts:
+            return None
+
+        # Walk back from the latest rate starting on or before the date,
+        # the most recent one still covering the date wins
+        rates = self._rates[item_id]
+        for idx in range(bisect_right(starts, target_date) - 1, -1, -1):
+            rate = rates[idx]
+            if rate.effective_to is None or rate.effective_to >= target_date:
+                return rate
+        return None
+
+class RateCache:
+    """Process-wide cache of RateHistory per customer.
+
+    Every invalidation bumps a generation counter; histories loaded before the
+    latest invalidation are dropped instead of cached so a slow loader can't
+    put back stale data. Invalidation only reaches this process, histories
+    older than the TTL are loaded again to pick up other workers' changes.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = RATE_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._histories: Dict[int, RateHistory] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, customer_id: int) -> Optional[RateHistory]:
+        history = self._histories.get(customer_id)
+        if history is not None and (
+            self.ttl_seconds is None or time.monotonic() - history.loaded_at < self.ttl_seconds
+        ):
+            return history
+        return None
+
+    def put_many(self, histories: Dict[int, RateHistory], generation: int):
+        with self._lock:
+            if generation == self._generation:
+                self._histories.update(histories)
+
+    def invalidate(self, customer_id: Optional[int] = None):
+        """Drop one customer's history, or everything when no customer is given"""
+        with self._lock:
+            self._generation += 1
+            if customer_id is None:
+                self._histories.clear()
+            else:
+                self._histories.pop(customer_id, None)
+
+rate_cache = RateCache()
+
+class SalesRateResolver:
+    """Answers (customer_id, item_id, date) rate lookups from memory.
+
+    The rate with the latest effective_from covering the date wins. Rates a
+    price change deactivated still cover the dates up to their effective_to, so
+    assignments dated before the change bind to the old rate.
+    """
+
+    def __init__(self, db: Session, cache: RateCache = rate_cache):
+        self.db = db
+        self.cache = cache
+
+    def resolve(self, customer_id: int, item_id: int, target_date: date) -> Optional[ResolvedRate]:
+        key = (customer_id, item_id, target_date)
+        return self.resolve_many([key])[key]
+
+    def resolve_many(self, keys: Iterable[RateKey]) -> Dict[RateKey, Optional[ResolvedRate]]:
+        """Resolve a whole list of keys, loading missing customers in one query"""
+        keys = list(keys)
+        histories = self._get_histories({customer_id for customer_id, _, _ in keys})
+        return {
+            (customer_id, item_id, target_date): histories[customer_id].lookup(item_id, target_date)
+            for customer_id, item_id, target_date in keys
+        }
+
+    def _get_histories(self, customer_ids) -> Dict[int, RateHistory]:
+        histories = {}
+        missing = []
+        for customer_id in customer_ids:
+            history = self.cache.get(customer_id)
+            if history is None:
+                missing.append(customer_id)
+            else:
+                histories[customer_id] = history
+
+        if missing:
+            generation = self.cache.generation
+            rows = self.db.execute(
+                select(
+                    database_models.SalesRate.id,
+                    database_models.SalesRate.customer_id,
+                    database_models.SalesRate.item_id,
+                    database_models.SalesRate.rate,
+                    database_models.SalesRate.effective_from,
+                    database_models.SalesRate.effective_to,
+                )
+                .where(
+                    database_models.SalesRate.customer_id.in_(missing),
+                    # Inactive rates without an end date never had an interval
+                    or_(
+                        database_models.SalesRate.is_active == True,
+                        database_models.SalesRate.effective_to.isnot(None)
+                    )
+                )
+            ).all()
+
+            rows_by_customer = {customer_id: [] for customer_id in missing}
+            for row in rows:
+                rows_by_customer[row.customer_id].append(row)
+            loaded = {
+                customer_id: RateHistory(customer_rows)
+                for customer_id, customer_rows in rows_by_customer.items()
+            }
+            self.cache.put_many(loaded, generation)
+            histories.update(loaded)
+
+        return histories
@@ -0,0 +1,88 @@
+from datetime import date
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.orm import Session
+import database_models
+
+# Rows fetched per round trip when streaming report results
+STREAM_BATCH_SIZE = 1000
+
+class ReportService:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def customer_statement(self, customer_id: int, date_from: date, date_to: date):
+        """Yield quantity and amount per day, item and rate for one customer.
+
+        Grouped in SQL against sales_rates, lines without a bound rate have
+        rate None and amount 0 like StockAssignment.total_price.
+        """
+        assignment = database_models.StockAssignment
+        rate = database_models.SalesRate
+        stmt = select(
+                assignment.assignment_date,
+                assignment.item_id,
+                database_models.Item.name.label("item_name"),
+                rate.rate,
+                func.sum(assignment.quantity).label("quantity"),
+                func.sum(assignment.quantity * func.coalesce(rate.rate, 0)).label("amount"),
+            )\
+            .join(database_models.Item, database_models.Item.id == assignment.item_id)\
+            .outerjoin(rate, rate.id == assignment.sales_rate_id)\
+            .where(
+                assignment.customer_id == customer_id,
+                assignment.assignment_date >= date_from,
+                assignment.assignment_date <= date_to
+            )\
+            .group_by(assignment.assignment_date, assignment.item_id, database_models.Item.name, rate.rate)\
+            .order_by(assignment.assignment_date, assignment.item_id)
+        
+        yield from self.db.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+    
+    def reconciliation(self, date_from: date, date_to: date):
+        """Produced, assigned and leftover quantity per day and item in one grouped query"""
+        production = database_models.Production
+        assignment = database_models.StockAssignment
+        movements = union_all(
+            select(
+                production.item_id,
+                production.production_date.label("day"),
+                production.quantity.label("produced"),
+                literal(0).label("assigned"),
+            ).where(production.production_date.between(date_from, date_to)),
+            select(
+                assignment.item_id,
+                assignment.assignment_date.label("day"),
+                literal(0).label("produced"),
+                assignment.quantity.label("assigned"),
+            ).where(assignment.assignment_date.between(date_from, date_to)),
+        ).subquery()
+        
+        stmt = select(
+                movements.c.day,
+                movements.c.item_id,
+                database_models.Item.name.label("item_name"),
+                func.sum(movements.c.produced).label("produced_quantity"),
+                func.sum(movements.c.assigned).label("assigned_quantity"),
+            )\
+            .join(database_models.Item, database_models.Item.id == movements.c.item_id)\
+            .group_by(movements.c.day, movements.c.item_id, database_models.Item.name)\
+            .order_by(movements.c.day, movements.c.item_id)
+        return self.db.execute(stmt).all()
+    
+    def reconciliation_from_totals(self, date_from: date, date_to: date):
+        """Same result as reconciliation, read from the incrementally maintained daily_item_totals"""
+        totals = database_models.DailyItemTotal
+        stmt = select(
+                totals.date.label("day"),
+                totals.item_id,
+                database_models.Item.name.label("item_name"),
+                totals.produced_quantity,
+                totals.assigned_quantity,
+            )\
+            .join(database_models.Item, database_models.Item.id == totals.item_id)\
+            .where(
+                totals.date.between(date_from, date_to),
+                (totals.produced_quantity != 0) | (totals.assigned_quantity != 0)
+            )\
+            .order_by(totals.date, totals.item_id)
+        return self.db.execute(stmt).all()
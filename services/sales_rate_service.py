@@ -1,35 +1,77 @@
 from datetime import datetime, date
-from typing import Optional
+from typing import List, Optional, Set
 from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import and_, or_
+from sqlalchemy import Date, Integer, and_, column, insert, literal, or_, select, union_all, update, values
 import database_models
 from models import SalesRateCreate, SalesRateUpdate
+from utils.pagination import DEFAULT_PAGE_SIZE, apply_keyset, build_page
+from services.rate_resolver import rate_cache
+from services.customer_view_service import invalidate_customer_views
+from utils.orm import attach_related
+from utils.expand import relationship_options
+
+EXPANDABLE = ("customer", "item", "created_by_user", "updated_by_user")
+
+# Price list lines per set-based UPDATE, keeps SQLite under its compound SELECT limit
+BATCH_CHUNK_SIZE = 500
+
+def _load_options(expand: Optional[Set[str]] = None):
+    return relationship_options(
+        database_models.SalesRate,
+        EXPANDABLE,
+        expand,
+        nested={"item": (database_models.Item.created_by_user,)}
+    )
+
+def _page_statement(limit, cursor, customer_id, item_id, date_from, date_to, is_active, expand):
+    stmt = select(database_models.SalesRate).options(*_load_options(expand))
+    
+    if customer_id is not None:
+        stmt = stmt.where(database_models.SalesRate.customer_id == customer_id)
+    if item_id is not None:
+        stmt = stmt.where(database_models.SalesRate.item_id == item_id)
+    if date_from is not None:
+        stmt = stmt.where(database_models.SalesRate.effective_from >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(database_models.SalesRate.effective_from <= date_to)
+    if is_active is not None:
+        stmt = stmt.where(database_models.SalesRate.is_active == is_active)
+    
+    return apply_keyset(
+        stmt,
+        database_models.SalesRate.effective_from,
+        database_models.SalesRate.id,
+        cursor,
+        limit
+    )
+
+def _by_id_statement(rate_id: int, expand: Optional[Set[str]] = None):
+    return select(database_models.SalesRate)\
+        .options(*_load_options(expand))\
+        .where(database_models.SalesRate.id == rate_id)
 
 class SalesRateService:
     def __init__(self, db: Session):
         self.db = db
     
-    def get_all(self):
-        return self.db.query(database_models.SalesRate)\
-            .options(
-                selectinload(database_models.SalesRate.customer),
-                selectinload(database_models.SalesRate.item),
-                selectinload(database_models.SalesRate.created_by_user),
-                selectinload(database_models.SalesRate.updated_by_user)
-            )\
-            .all()
+    def get_page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        customer_id: Optional[int] = None,
+        item_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        is_active: Optional[bool] = None,
+        expand: Optional[Set[str]] = None,
+    ):
+        stmt = _page_statement(limit, cursor, customer_id, item_id, date_from, date_to, is_active, expand)
+        return build_page(self.db.scalars(stmt).all(), limit, "effective_from")
     
-    def get_by_id(self, rate_id: int):
-        return self.db.query(database_models.SalesRate)\
-            .options(
-                selectinload(database_models.SalesRate.customer),
-                selectinload(database_models.SalesRate.item),
-                selectinload(database_models.SalesRate.created_by_user),
-                selectinload(database_models.SalesRate.updated_by_user)
-            )\
-            .filter(database_models.SalesRate.id == rate_id)\
-            .first()
+    def get_by_id(self, rate_id: int, expand: Optional[Set[str]] = None):
+        return self.db.scalars(_by_id_statement(rate_id, expand)).first()
     
     def create(self, rate_data: SalesRateCreate, created_by_user_id: Optional[int] = None, updated_by_user_id: Optional[int] = None):
         # Rule 1: If creating a new active rate, deactivate previous active rates
@@ -48,14 +90,22 @@ class SalesRateService:
         if updated_by_user_id:
             rate_dict['updated_by'] = updated_by_user_id
         
-        rate = database_models.SalesRate(**rate_dict)
-        self.db.add(rate)
+        rate = self.db.scalars(
+            insert(database_models.SalesRate).returning(database_models.SalesRate),
+            [rate_dict]
+        ).one()
         self.db.commit()
-        self.db.refresh(rate)
+        rate_cache.invalidate(rate.customer_id)
+        invalidate_customer_views(rate.customer_id)
         
-        # Load relationships for response
-        rate = self.get_by_id(rate.id)
-        return rate
+        # Relationships for the response come from the identity map, not a reload
+        return attach_related(
+            self.db, rate,
+            customer=(database_models.User, rate.customer_id),
+            item=(database_models.Item, rate.item_id),
+            created_by_user=(database_models.User, rate.created_by),
+            updated_by_user=(database_models.User, rate.updated_by)
+        )
     
     def update(self, rate_id: int, rate_data: SalesRateUpdate, updated_by_user_id: Optional[int] = None):
         rate = self.get_by_id(rate_id)
@@ -102,11 +152,14 @@ class SalesRateService:
             setattr(rate, field, value)
         
         self.db.commit()
-        self.db.refresh(rate)
+        rate_cache.invalidate(rate.customer_id)
+        invalidate_customer_views(rate.customer_id)
         
-        # Reload with relationships
-        rate = self.get_by_id(rate_id)
-        return rate
+        # The rate was loaded with its relationships, only updated_by may have moved
+        return attach_related(
+            self.db, rate,
+            updated_by_user=(database_models.User, rate.updated_by)
+        )
     
     def delete(self, rate_id: int, updated_by_user_id: Optional[int] = None):
         rate = self.get_by_id(rate_id)
@@ -135,11 +188,97 @@ class SalesRateService:
                 previous_rate.updated_by = updated_by_user_id  # Track who reactivated
                 self.db.add(previous_rate)
         
+        customer_id = rate.customer_id
         self.db.delete(rate)
         self.db.commit()
+        rate_cache.invalidate(customer_id)
+        invalidate_customer_views(customer_id)
         return True
     
+    def create_batch(self, rates: List[SalesRateCreate], created_by_user_id: Optional[int] = None, updated_by_user_id: Optional[int] = None):
+        """Apply a whole price list in one transaction.
+
+        Same rules as create: every new active rate deactivates the active rates
+        of its customer-item that overlap its effective_from, done here with one
+        UPDATE ... FROM per chunk followed by a single multi-row INSERT.
+        """
+        pairs = [(rate.customer_id, rate.item_id) for rate in rates]
+        if len(set(pairs)) != len(pairs):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A price list may contain each customer-item pair only once"
+            )
+        
+        active_lines = [rate for rate in rates if rate.is_active]
+        for start in range(0, len(active_lines), BATCH_CHUNK_SIZE):
+            self._deactivate_overlapping_rates(active_lines[start:start + BATCH_CHUNK_SIZE], updated_by_user_id)
+        
+        rows = []
+        for rate_data in rates:
+            rate_dict = rate_data.model_dump()
+            if created_by_user_id:
+                rate_dict['created_by'] = created_by_user_id
+            if updated_by_user_id:
+                rate_dict['updated_by'] = updated_by_user_id
+            rows.append(rate_dict)
+        
+        created = []
+        if rows:
+            created = self.db.scalars(
+                insert(database_models.SalesRate)
+                .returning(database_models.SalesRate, sort_by_parameter_order=True),
+                rows
+            ).all()
+        self.db.commit()
+        
+        for customer_id in {rate.customer_id for rate in rates}:
+            rate_cache.invalidate(customer_id)
+        invalidate_customer_views(*[rate.customer_id for rate in rates])
+        return created
+    
     # Helper methods
+    def _price_list_lines(self, lines: List[SalesRateCreate]):
+        """(customer_id, item_id, effective_from) of the lines as a selectable to join against"""
+        if self.db.get_bind().dialect.name == "postgresql":
+            return values(
+                column("customer_id", Integer),
+                column("item_id", Integer),
+                column("effective_from", Date),
+                name="price_list"
+            ).data([(line.customer_id, line.item_id, line.effective_from) for line in lines])
+        
+        # SQLite has no column aliases on VALUES, a UNION ALL of literal rows does the same
+        return union_all(*[
+            select(
+                literal(line.customer_id, Integer).label("customer_id"),
+                literal(line.item_id, Integer).label("item_id"),
+                literal(line.effective_from, Date).label("effective_from"),
+            )
+            for line in lines
+        ]).subquery("price_list")
+    
+    def _deactivate_overlapping_rates(self, lines: List[SalesRateCreate], updated_by_user_id: Optional[int] = None):
+        """Set-based version of _deactivate_previous_rates for many lines at once"""
+        price_list = self._price_list_lines(lines)
+        stmt = update(database_models.SalesRate)\
+            .where(
+                database_models.SalesRate.customer_id == price_list.c.customer_id,
+                database_models.SalesRate.item_id == price_list.c.item_id,
+                database_models.SalesRate.is_active == True,
+                database_models.SalesRate.effective_from <= price_list.c.effective_from,
+                or_(
+                    database_models.SalesRate.effective_to.is_(None),
+                    database_models.SalesRate.effective_to >= price_list.c.effective_from
+                )
+            )\
+            .values(
+                is_active=False,
+                effective_to=price_list.c.effective_from,
+                updated_by=updated_by_user_id
+            )\
+            .execution_options(synchronize_session=False)
+        self.db.execute(stmt)
+    
     def _deactivate_previous_rates(self, customer_id: int, item_id: int, effective_from: date, updated_by_user_id: Optional[int] = None):
         """Deactivate any active rates that overlap with the new effective_from date"""
         previous_active_rates = self.db.query(database_models.SalesRate)\
@@ -200,4 +339,26 @@ class SalesRateService:
                     )
                 )
             )\
-            .first()
\ No newline at end of file
+            .first()
+
+class AsyncSalesRateService:
+    """Read side of SalesRateService on an AsyncSession"""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        customer_id: Optional[int] = None,
+        item_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        is_active: Optional[bool] = None,
+        expand: Optional[Set[str]] = None,
+    ):
+        stmt = _page_statement(limit, cursor, customer_id, item_id, date_from, date_to, is_active, expand)
+        return build_page((await self.db.scalars(stmt)).all(), limit, "effective_from")
+    
+    async def get_by_id(self, rate_id: int, expand: Optional[Set[str]] = None):
+        return (await self.db.scalars(_by_id_statement(rate_id, expand))).first()
@@ -0,0 +1,79 @@
+from datetime import date, datetime, timezone
+from typing import Optional
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+import database_models
+
+class SalesSummaryService:
+    """Maintains daily_sales_summary from stock assignments and their bound rates.
+
+    Days whose WorkingDay is closed and already summarized are frozen: their rows
+    are final and the rollup skips them. Every other day in a range is
+    recomputed, so running the rollup again only touches days that can change.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+
+    def summarize(self, date_from: date, date_to: date, force: bool = False) -> int:
+        """Recompute the range without committing, returns the number of rows written"""
+        summary = database_models.DailySalesSummary
+        assignment = database_models.StockAssignment
+        rate = database_models.SalesRate
+        day = database_models.WorkingDay
+
+        in_range = assignment.assignment_date.between(date_from, date_to)
+        summary_in_range = summary.date.between(date_from, date_to)
+        if not force:
+            frozen_days = select(day.date).where(
+                day.date.between(date_from, date_to),
+                day.status == database_models.WorkingDayStatus.CLOSE,
+                day.summarized_at.is_not(None)
+            )
+            in_range = in_range & assignment.assignment_date.not_in(frozen_days)
+            summary_in_range = summary_in_range & summary.date.not_in(frozen_days)
+
+        self.db.execute(delete(summary).where(summary_in_range))
+
+        # Unbound lines count with amount 0, like StockAssignment.total_price
+        rows = select(
+                assignment.assignment_date,
+                assignment.customer_id,
+                assignment.item_id,
+                func.sum(assignment.quantity),
+                func.sum(assignment.quantity * func.coalesce(rate.rate, 0)),
+            )\
+            .outerjoin(rate, rate.id == assignment.sales_rate_id)\
+            .where(in_range)\
+            .group_by(assignment.assignment_date, assignment.customer_id, assignment.item_id)
+        result = self.db.execute(
+            insert(summary).from_select(["date", "customer_id", "item_id", "quantity", "amount"], rows)
+        )
+
+        # Closed days are now final
+        self.db.execute(
+            update(day)
+            .where(
+                day.date.between(date_from, date_to),
+                day.status == database_models.WorkingDayStatus.CLOSE,
+                day.summarized_at.is_(None)
+            )
+            .values(summarized_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def rollup(self, date_from: date, date_to: date, force: bool = False) -> int:
+        """Run summarize for a range as its own transaction"""
+        lines = self.summarize(date_from, date_to, force=force)
+        self.db.commit()
+        return lines
+
+    def get_daily_sales(self, date_from: date, date_to: date, customer_id: Optional[int] = None, item_id: Optional[int] = None):
+        summary = database_models.DailySalesSummary
+        stmt = select(summary).where(summary.date.between(date_from, date_to))
+        if customer_id is not None:
+            stmt = stmt.where(summary.customer_id == customer_id)
+        if item_id is not None:
+            stmt = stmt.where(summary.item_id == item_id)
+        stmt = stmt.order_by(summary.date, summary.customer_id, summary.item_id)
+        return self.db.scalars(stmt).all()
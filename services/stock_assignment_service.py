@@ -1,60 +1,209 @@
+from datetime import date
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 from fastapi import HTTPException, status
-from typing import Optional
+from typing import List, Optional, Set
 import database_models
-from models import StockAssignmentCreate, StockAssignmentUpdate
+from models import StockAssignmentCreate, StockAssignmentUpdate, StockAssignmentBulkResult
+from utils.pagination import DEFAULT_PAGE_SIZE, apply_keyset, build_page
+from services.rate_resolver import SalesRateResolver
+from services.item_totals_service import ItemTotalsService
+from services.working_day_calendar import insert_on_open_days, open_for_write, working_day_calendar
+from services.customer_view_service import invalidate_customer_views
+from utils.orm import attach_related
+from utils.expand import relationship_options
+
+EXPANDABLE = ("customer", "item", "created_by_user")
+
+def _load_options(expand: Optional[Set[str]] = None):
+    # sales_rate is already flat and total_price needs it, so it is always loaded
+    return [
+        selectinload(database_models.StockAssignment.sales_rate),
+        *relationship_options(
+            database_models.StockAssignment,
+            EXPANDABLE,
+            expand,
+            nested={"item": (database_models.Item.created_by_user,)}
+        )
+    ]
+
+def _page_statement(limit, cursor, customer_id, item_id, date_from, date_to, expand):
+    stmt = select(database_models.StockAssignment).options(*_load_options(expand))
+    
+    # Filters are applied server side so only one page is ever loaded
+    if customer_id is not None:
+        stmt = stmt.where(database_models.StockAssignment.customer_id == customer_id)
+    if item_id is not None:
+        stmt = stmt.where(database_models.StockAssignment.item_id == item_id)
+    if date_from is not None:
+        stmt = stmt.where(database_models.StockAssignment.assignment_date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(database_models.StockAssignment.assignment_date <= date_to)
+    
+    return apply_keyset(
+        stmt,
+        database_models.StockAssignment.assignment_date,
+        database_models.StockAssignment.id,
+        cursor,
+        limit
+    )
+
+def _by_id_statement(assignment_id: int, expand: Optional[Set[str]] = None):
+    return select(database_models.StockAssignment)\
+        .options(*_load_options(expand))\
+        .where(database_models.StockAssignment.id == assignment_id)
 
 class StockAssignmentService:
     def __init__(self, db: Session):
         self.db = db
     
-    def get_all(self):
-        return self.db.query(database_models.StockAssignment)\
-            .options(
-                selectinload(database_models.StockAssignment.customer),
-                selectinload(database_models.StockAssignment.item),
-                selectinload(database_models.StockAssignment.sales_rate),
-                selectinload(database_models.StockAssignment.created_by_user)  # ADDED
-            )\
-            .all()
+    def get_page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        customer_id: Optional[int] = None,
+        item_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        expand: Optional[Set[str]] = None,
+    ):
+        stmt = _page_statement(limit, cursor, customer_id, item_id, date_from, date_to, expand)
+        return build_page(self.db.scalars(stmt).all(), limit, "assignment_date")
     
-    def get_by_id(self, assignment_id: int):
-        return self.db.query(database_models.StockAssignment)\
-            .options(
-                selectinload(database_models.StockAssignment.customer),
-                selectinload(database_models.StockAssignment.item),
-                selectinload(database_models.StockAssignment.sales_rate),
-                selectinload(database_models.StockAssignment.created_by_user)  # ADDED
-            )\
-            .filter(database_models.StockAssignment.id == assignment_id)\
-            .first()
+    def get_by_id(self, assignment_id: int, expand: Optional[Set[str]] = None):
+        return self.db.scalars(_by_id_statement(assignment_id, expand)).first()
     
     def create(self, assignment_data: StockAssignmentCreate, created_by_user_id: Optional[int] = None):
+        working_day_calendar.ensure_writable(self.db, assignment_data.assignment_date)
+        
         # Set created_by if provided
         assignment_dict = assignment_data.model_dump()
         if created_by_user_id:
             assignment_dict['created_by'] = created_by_user_id
         
-        assignment = database_models.StockAssignment(**assignment_dict)
-        self.db.add(assignment)
+        # The closed-day check is part of the INSERT, nothing is read in front of it
+        assignment = insert_on_open_days(
+            self.db, database_models.StockAssignment, "assignment_date", [assignment_dict]
+        )[0]
+        if assignment is None:
+            working_day_calendar.reject_write(self.db, assignment_data.assignment_date)
+        ItemTotalsService(self.db)\
+            .add(assignment.item_id, assignment.assignment_date, assigned=assignment.quantity)\
+            .flush()
         self.db.commit()
-        self.db.refresh(assignment)
+        invalidate_customer_views(assignment.customer_id)
         
-        # Load relationships for response
-        assignment = self.get_by_id(assignment.id)
-        return assignment
+        # Relationships for the response come from the identity map, not a reload
+        return attach_related(
+            self.db, assignment,
+            customer=(database_models.User, assignment.customer_id),
+            item=(database_models.Item, assignment.item_id),
+            sales_rate=(database_models.SalesRate, assignment.sales_rate_id),
+            created_by_user=(database_models.User, assignment.created_by)
+        )
+    
+    def create_bulk(self, assignments: List[StockAssignmentCreate], created_by_user_id: Optional[int] = None):
+        """Insert many assignments in one transaction, binding missing rates by assignment_date.
+
+        Lines pointing at an unknown customer, item or sales rate or at a closed
+        day are reported and skipped, everything else goes out as one INSERT ...
+        SELECT that leaves out the days closed by another worker in the same statement.
+        """
+        customer_ids = {a.customer_id for a in assignments}
+        item_ids = {a.item_id for a in assignments}
+        known_customers = set(self.db.scalars(
+            select(database_models.User.id).where(database_models.User.id.in_(customer_ids))
+        ))
+        known_items = set(self.db.scalars(
+            select(database_models.Item.id).where(database_models.Item.id.in_(item_ids))
+        ))
+        rate_ids = {a.sales_rate_id for a in assignments if a.sales_rate_id is not None}
+        known_rates = set(self.db.scalars(
+            select(database_models.SalesRate.id).where(database_models.SalesRate.id.in_(rate_ids))
+        )) if rate_ids else set()
+        closed_days = set(working_day_calendar.closed_days(self.db, {a.assignment_date for a in assignments}))
+        
+        results = [StockAssignmentBulkResult(index=index) for index in range(len(assignments))]
+        valid = []
+        for index, assignment in enumerate(assignments):
+            if assignment.customer_id not in known_customers:
+                results[index].error = f"Customer {assignment.customer_id} not found"
+            elif assignment.item_id not in known_items:
+                results[index].error = f"Item {assignment.item_id} not found"
+            elif assignment.sales_rate_id is not None and assignment.sales_rate_id not in known_rates:
+                results[index].error = f"Sales rate {assignment.sales_rate_id} not found"
+            elif assignment.assignment_date in closed_days:
+                results[index].error = f"Working day {assignment.assignment_date} is closed"
+            else:
+                valid.append((index, assignment))
+        
+        # Resolve every missing rate in memory against the rate history
+        resolved = SalesRateResolver(self.db).resolve_many(
+            (a.customer_id, a.item_id, a.assignment_date)
+            for _, a in valid if a.sales_rate_id is None
+        )
+        
+        rows = []
+        for index, assignment in valid:
+            row = assignment.model_dump()
+            if created_by_user_id:
+                row['created_by'] = created_by_user_id
+            if row['sales_rate_id'] is None:
+                rate = resolved[(assignment.customer_id, assignment.item_id, assignment.assignment_date)]
+                row['sales_rate_id'] = rate.id if rate else None
+            rows.append(row)
+        
+        inserted = insert_on_open_days(self.db, database_models.StockAssignment, "assignment_date", rows)
+        written = []
+        for (index, assignment), created in zip(valid, inserted):
+            if created is None:
+                results[index].error = f"Working day {assignment.assignment_date} is closed"
+            else:
+                results[index].id = created.id
+                results[index].sales_rate_id = created.sales_rate_id
+                written.append(created)
+        if len(written) < len(rows):
+            working_day_calendar.invalidate()
+        
+        if written:
+            totals = ItemTotalsService(self.db)
+            for created in written:
+                totals.add(created.item_id, created.assignment_date, assigned=created.quantity)
+            totals.flush()
+            self.db.commit()
+            invalidate_customer_views(*[created.customer_id for created in written])
+        
+        return results
     
     def update(self, assignment_id: int, assignment_data: StockAssignmentUpdate):
         assignment = self.get_by_id(assignment_id)
         if not assignment:
             return None
         
-        update_data = assignment_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(assignment, field, value)
+        working_day_calendar.ensure_writable(self.db, assignment.assignment_date)
+        
+        previous_quantity = assignment.quantity
+        # rate is not a column, the price of a line comes from its sales_rate
+        update_data = assignment_data.model_dump(exclude_unset=True, exclude={"rate"})
+        if not update_data:
+            return assignment
+        result = self.db.execute(
+            update(database_models.StockAssignment)
+            .where(
+                database_models.StockAssignment.id == assignment_id,
+                open_for_write(database_models.StockAssignment.assignment_date)
+            )
+            .values(**update_data)
+        )
+        if result.rowcount == 0:
+            working_day_calendar.reject_write(self.db, assignment.assignment_date)
         
+        ItemTotalsService(self.db)\
+            .add(assignment.item_id, assignment.assignment_date, assigned=assignment.quantity - previous_quantity)\
+            .flush()
         self.db.commit()
-        self.db.refresh(assignment)
+        invalidate_customer_views(assignment.customer_id)
         return assignment
     
     def delete(self, assignment_id: int):
@@ -62,6 +211,42 @@ class StockAssignmentService:
         if not assignment:
             return False
         
-        self.db.delete(assignment)
+        working_day_calendar.ensure_writable(self.db, assignment.assignment_date)
+        
+        result = self.db.execute(
+            delete(database_models.StockAssignment)
+            .where(
+                database_models.StockAssignment.id == assignment_id,
+                open_for_write(database_models.StockAssignment.assignment_date)
+            )
+        )
+        if result.rowcount == 0:
+            working_day_calendar.reject_write(self.db, assignment.assignment_date)
+        
+        ItemTotalsService(self.db)\
+            .add(assignment.item_id, assignment.assignment_date, assigned=-assignment.quantity)\
+            .flush()
         self.db.commit()
-        return True
\ No newline at end of file
+        invalidate_customer_views(assignment.customer_id)
+        return True
+
+class AsyncStockAssignmentService:
+    """Read side of StockAssignmentService on an AsyncSession"""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        customer_id: Optional[int] = None,
+        item_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        expand: Optional[Set[str]] = None,
+    ):
+        stmt = _page_statement(limit, cursor, customer_id, item_id, date_from, date_to, expand)
+        return build_page((await self.db.scalars(stmt)).all(), limit, "assignment_date")
+    
+    async def get_by_id(self, assignment_id: int, expand: Optional[Set[str]] = None):
+        return (await self.db.scalars(_by_id_statement(assignment_id, expand))).first()
@@ -1,8 +1,15 @@
 # services/user_service.py
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 import database_models
 from models import UserCreate, UserUpdate
+from services.auth_service import principal_cache
+from utils.http_cache import response_cache
+
+# Items and working days embed their creator when expanded
+USER_CACHE_NAMESPACES = ("users", "items", "working-days")
 
 class UserService:
     def __init__(self, db: Session):
@@ -30,10 +37,12 @@ class UserService:
                 detail="User with this name already exists"
             )
         
-        user = database_models.User(**user_data.model_dump())
-        self.db.add(user)
+        user = self.db.scalars(
+            insert(database_models.User).returning(database_models.User),
+            [user_data.model_dump()]
+        ).one()
         self.db.commit()
-        self.db.refresh(user)
+        response_cache.invalidate(*USER_CACHE_NAMESPACES)
         return user
     
     def update(self, user_id: int, user_data: UserUpdate):
@@ -56,7 +65,8 @@ class UserService:
             setattr(user, field, value)
         
         self.db.commit()
-        self.db.refresh(user)
+        principal_cache.delete(user_id)
+        response_cache.invalidate(*USER_CACHE_NAMESPACES)
         return user
     
     def delete(self, user_id: int):
@@ -66,4 +76,18 @@ class UserService:
         
         self.db.delete(user)
         self.db.commit()
-        return True
\ No newline at end of file
+        principal_cache.delete(user_id)
+        response_cache.invalidate(*USER_CACHE_NAMESPACES)
+        return True
+
+class AsyncUserService:
+    """Read side of UserService on an AsyncSession"""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_all(self):
+        return (await self.db.scalars(select(database_models.User))).all()
+    
+    async def get_by_id(self, user_id: int):
+        return await self.db.get(database_models.User, user_id)
+
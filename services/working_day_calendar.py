@@ -0,0 +1,196 @@
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional
+import os
+import threading
+import time
+from fastapi import HTTPException, status
+from sqlalchemy import Integer, column, exists, insert, literal, select, union_all, values
+from sqlalchemy.orm import Session
+import database_models
+
+# Upper bound on how long another worker's working day changes can go unseen
+WORKING_DAY_CALENDAR_TTL_SECONDS = float(os.getenv("WORKING_DAY_CALENDAR_TTL_SECONDS", "300"))
+# Rows per INSERT ... SELECT of insert_on_open_days, SQLite caps a UNION ALL at 500 selects
+WRITE_CHUNK_SIZE = 500
+
+class CalendarDay(NamedTuple):
+    id: int
+    date: date
+    status: database_models.WorkingDayStatus
+    is_working: bool
+
+class CalendarSnapshot:
+    """Every working day keyed by date, with a sorted date list for range scans"""
+
+    def __init__(self, rows: Iterable = ()):
+        self._days: Dict[date, CalendarDay] = {
+            row.date: CalendarDay(row.id, row.date, row.status, bool(row.is_working))
+            for row in rows
+        }
+        self._dates = sorted(self._days)
+        self.loaded_at = time.monotonic()
+
+    def get(self, day: date) -> Optional[CalendarDay]:
+        return self._days.get(day)
+
+    def between(self, date_from: date, date_to: date) -> List[CalendarDay]:
+        start = bisect_left(self._dates, date_from)
+        end = bisect_right(self._dates, date_to)
+        return [self._days[day] for day in self._dates[start:end]]
+
+class WorkingDayCalendar:
+    """Process-wide in-memory copy of the working_days table.
+
+    The table holds one row per calendar day, so the whole of it is loaded in
+    one query and answered from memory until a WorkingDayService mutation
+    invalidates it or the TTL passes. Same generation counter as RateCache so
+    a load racing an invalidation is not kept.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = WORKING_DAY_CALENDAR_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[CalendarSnapshot] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def snapshot(self, db: Session) -> CalendarSnapshot:
+        """Current calendar, loading it with db when missing or expired.
+
+        Takes a sync Session, async callers go through AsyncSession.run_sync.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and (
+            self.ttl_seconds is None or time.monotonic() - snapshot.loaded_at < self.ttl_seconds
+        ):
+            return snapshot
+
+        generation = self._generation
+        rows = db.execute(
+            select(
+                database_models.WorkingDay.id,
+                database_models.WorkingDay.date,
+                database_models.WorkingDay.status,
+                database_models.WorkingDay.is_working,
+            )
+        ).all()
+        snapshot = CalendarSnapshot(rows)
+        with self._lock:
+            if generation == self._generation:
+                self._snapshot = snapshot
+        return snapshot
+
+    def get(self, db: Session, day: date) -> Optional[CalendarDay]:
+        return self.snapshot(db).get(day)
+
+    def between(self, db: Session, date_from: date, date_to: date) -> List[CalendarDay]:
+        return self.snapshot(db).between(date_from, date_to)
+
+    def is_open(self, db: Session, day: date) -> bool:
+        """True when the date has an open working day"""
+        calendar_day = self.get(db, day)
+        return (
+            calendar_day is not None
+            and calendar_day.status == database_models.WorkingDayStatus.OPEN
+            and calendar_day.is_working
+        )
+
+    def is_closed(self, db: Session, day: date) -> bool:
+        """True when the date has a closed working day, dates without one are not closed"""
+        calendar_day = self.get(db, day)
+        return calendar_day is not None and calendar_day.status == database_models.WorkingDayStatus.CLOSE
+
+    def closed_days(self, db: Session, days: Iterable[date]) -> List[date]:
+        snapshot = self.snapshot(db)
+        return sorted({
+            day for day in days
+            if (calendar_day := snapshot.get(day)) is not None
+            and calendar_day.status == database_models.WorkingDayStatus.CLOSE
+        })
+
+    def ensure_writable(self, db: Session, *days: date):
+        """Rule: stock and production of a closed day are final, raise 400 for writes to it.
+
+        Only the fast reject path from the cached calendar. The write itself
+        carries open_for_write, a close this process has not seen yet makes it
+        a zero-row write that ends in reject_write.
+        """
+        closed = self.closed_days(db, days)
+        if closed:
+            raise _closed_error(closed)
+
+    def reject_write(self, db: Session, *days: date):
+        """Raise 400 for a write that open_for_write turned into zero rows.
+
+        The cached calendar missed the close, it is reloaded to name the day.
+        """
+        self.invalidate()
+        raise _closed_error(self.closed_days(db, days) or sorted(set(days)))
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+
+working_day_calendar = WorkingDayCalendar()
+
+def _closed_error(days: Iterable[date]) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Working day {', '.join(str(day) for day in days)} is closed"
+    )
+
+def open_for_write(*days):
+    """Condition for the WHERE of a write: none of days (dates or date columns) is closed.
+
+    Evaluated by the write statement itself, so a close committed by another
+    worker is seen without a lookup query in front of every write.
+    """
+    return ~exists().where(
+        database_models.WorkingDay.date.in_(days),
+        database_models.WorkingDay.status == database_models.WorkingDayStatus.CLOSE
+    )
+
+def _literal_rows(db: Session, table, keys: List[str], rows: List[dict]):
+    """The rows as a selectable with an ordinal column, typed like the table's columns"""
+    if db.get_bind().dialect.name == "postgresql":
+        return values(
+            column("ordinal", Integer),
+            *[column(key, table.c[key].type) for key in keys],
+            name="lines"
+        ).data([(ordinal, *[row[key] for key in keys]) for ordinal, row in enumerate(rows)])
+
+    # SQLite has no column aliases on VALUES, a UNION ALL of literal rows does the same
+    return union_all(*[
+        select(
+            literal(ordinal, Integer).label("ordinal"),
+            *[literal(row[key], table.c[key].type).label(key) for key in keys]
+        )
+        for ordinal, row in enumerate(rows)
+    ]).subquery("lines")
+
+def insert_on_open_days(db: Session, model, date_key: str, rows: List[dict]) -> list:
+    """INSERT ... SELECT the rows, leaving out those whose date_key is a closed working day.
+
+    Returns the inserted object of every row in order, None for the rows left out.
+    All rows of a date go in or stay out together, so the objects are matched
+    back to the rows by date and, within the chunk, by id order.
+    """
+    keys = list(rows[0]) if rows else []
+    results = []
+    for start in range(0, len(rows), WRITE_CHUNK_SIZE):
+        chunk = rows[start:start + WRITE_CHUNK_SIZE]
+        lines = _literal_rows(db, model.__table__, keys, chunk)
+        stmt = insert(model)\
+            .from_select(
+                keys,
+                select(*[lines.c[key] for key in keys])
+                .where(open_for_write(lines.c[date_key]))
+                .order_by(lines.c.ordinal)
+            )\
+            .returning(model)
+        inserted = sorted(db.scalars(stmt).all(), key=lambda obj: obj.id)
+        written = {getattr(obj, date_key) for obj in inserted}
+        objects = iter(inserted)
+        results.extend(next(objects) if row[date_key] in written else None for row in chunk)
+    return results
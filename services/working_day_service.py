@@ -1,8 +1,22 @@
+import calendar
+from datetime import date, timedelta
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from fastapi import HTTPException, status
 import database_models
-from typing import Optional
-from models import WorkingDayCreate, WorkingDayUpdate
+from typing import List, Optional, Set
+from models import WorkingDayCalendarEntry, WorkingDayCreate, WorkingDayMonthCreate, WorkingDayUpdate
+from utils.orm import attach_related
+from utils.expand import relationship_options
+from utils.http_cache import response_cache
+from utils.locks import share_table_lock
+from services.sales_summary_service import SalesSummaryService
+from services.forecast_service import ForecastService
+from services.working_day_calendar import working_day_calendar
+
+EXPANDABLE = ("created_by_user",)
 
 class WorkingDayService:
     def __init__(self, db: Session):
@@ -36,26 +50,90 @@ class WorkingDayService:
         if created_by_user_id:
             day_dict['created_by'] = created_by_user_id
         
-        day = database_models.WorkingDay(**day_dict)
-        self.db.add(day)
+        day = self.db.scalars(
+            insert(database_models.WorkingDay).returning(database_models.WorkingDay),
+            [day_dict]
+        ).one()
+        if day.status == database_models.WorkingDayStatus.CLOSE:
+            self._finalize_closed([day])
         self.db.commit()
-        self.db.refresh(day)
+        self._invalidate()
         
-        # Load relationships for response
-        day = self.get_by_id(day.id)
-        return day
+        # Relationships for the response come from the identity map, not a reload
+        return attach_related(
+            self.db, day,
+            created_by_user=(database_models.User, day.created_by)
+        )
+    
+    def create_month(self, month_data: WorkingDayMonthCreate, created_by_user_id: Optional[int] = None):
+        """Create a working day for every date of a month that has none yet, in one INSERT"""
+        if any(weekday not in range(7) for weekday in month_data.non_working_weekdays):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="non_working_weekdays must be between 0 (Monday) and 6 (Sunday)"
+            )
+        
+        first_day = date(month_data.year, month_data.month, 1)
+        last_day = first_day + timedelta(days=calendar.monthrange(month_data.year, month_data.month)[1] - 1)
+        # Read from the database, the cached calendar can miss days another worker just created
+        existing = set(self.db.scalars(
+            select(database_models.WorkingDay.date)
+            .where(database_models.WorkingDay.date.between(first_day, last_day))
+        ))
+        
+        rows = []
+        day = first_day
+        while day <= last_day:
+            if day not in existing:
+                rows.append({
+                    "date": day,
+                    "status": month_data.status,
+                    "is_working": day.weekday() not in month_data.non_working_weekdays,
+                    "created_by": created_by_user_id,
+                })
+            day += timedelta(days=1)
+        
+        if not rows:
+            return []
+        # Partitions are DDL under a cross-worker lock, they are created at startup and by
+        # scripts/manage_partitions.py, never in this request. Rows of a month without
+        # one land in the DEFAULT partition until the next ensure moves them.
+        days = self.db.scalars(
+            insert(database_models.WorkingDay)
+            .returning(database_models.WorkingDay, sort_by_parameter_order=True),
+            rows
+        ).all()
+        if month_data.status == database_models.WorkingDayStatus.CLOSE:
+            self._finalize_closed(days)
+        self.db.commit()
+        self._invalidate()
+        
+        for day in days:
+            attach_related(self.db, day, created_by_user=(database_models.User, day.created_by))
+        return days
+    
+    def get_calendar(self, date_from: date, date_to: date) -> List[WorkingDayCalendarEntry]:
+        return build_calendar(working_day_calendar.between(self.db, date_from, date_to), date_from, date_to)
     
     def update(self, day_id: int, day_data: WorkingDayUpdate):
         day = self.get_by_id(day_id)
         if not day:
             return None
         
+        was_closed = day.status == database_models.WorkingDayStatus.CLOSE
         update_data = day_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(day, field, value)
         
+        is_closed = day.status == database_models.WorkingDayStatus.CLOSE
+        if is_closed and not was_closed:
+            self._finalize_closed([day])
+        elif was_closed and not is_closed:
+            # Reopened days can change again, the next rollup recomputes them
+            day.summarized_at = None
+        
         self.db.commit()
-        self.db.refresh(day)
+        self._invalidate()
         return day
     
     def delete(self, day_id: int):
@@ -65,4 +143,76 @@ class WorkingDayService:
         
         self.db.delete(day)
         self.db.commit()
-        return True
\ No newline at end of file
+        self._invalidate()
+        return True
+    
+    def _finalize_closed(self, days):
+        """Rule: closing days fixes their sales summary and feeds them to the
+        production forecast, in the same transaction. Also runs for days created closed.
+
+        Writes check for a closed day inside their own statement. The table lock
+        lets the writes already past that check commit before the summary reads,
+        and makes later ones wait for the close, so they see it.
+        """
+        share_table_lock(self.db, "stock_assignments", "production")
+        self.db.flush()
+        dates = [day.date for day in days]
+        SalesSummaryService(self.db).summarize(min(dates), max(dates))
+        ForecastService(self.db).update()
+        # summarize sets summarized_at in a bulk UPDATE, copy it onto the objects in one query
+        summarized_at = dict(self.db.execute(
+            select(database_models.WorkingDay.id, database_models.WorkingDay.summarized_at)
+            .where(database_models.WorkingDay.id.in_([day.id for day in days]))
+        ).all())
+        for day in days:
+            set_committed_value(day, "summarized_at", summarized_at[day.id])
+    
+    def _invalidate(self):
+        response_cache.invalidate("working-days")
+        working_day_calendar.invalidate()
+
+def build_calendar(days, date_from: date, date_to: date) -> List[WorkingDayCalendarEntry]:
+    """One entry per date of the range, dates without a working day are not open"""
+    by_date = {day.date: day for day in days}
+    entries = []
+    current = date_from
+    while current <= date_to:
+        day = by_date.get(current)
+        if day is None:
+            entries.append(WorkingDayCalendarEntry(date=current))
+        else:
+            entries.append(WorkingDayCalendarEntry(
+                date=current,
+                id=day.id,
+                status=day.status.value,
+                is_working=day.is_working,
+                is_open=day.status == database_models.WorkingDayStatus.OPEN and day.is_working
+            ))
+        current += timedelta(days=1)
+    return entries
+
+class AsyncWorkingDayService:
+    """Read side of WorkingDayService on an AsyncSession"""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_all(self, expand: Optional[Set[str]] = None):
+        result = await self.db.scalars(
+            select(database_models.WorkingDay)
+            .options(*relationship_options(database_models.WorkingDay, EXPANDABLE, expand))
+        )
+        return result.all()
+    
+    async def get_by_id(self, day_id: int, expand: Optional[Set[str]] = None):
+        result = await self.db.scalars(
+            select(database_models.WorkingDay)
+            .options(*relationship_options(database_models.WorkingDay, EXPANDABLE, expand))
+            .where(database_models.WorkingDay.id == day_id)
+        )
+        return result.first()
+    
+    async def get_calendar(self, date_from: date, date_to: date) -> List[WorkingDayCalendarEntry]:
+        # Only touches the database when the calendar cache is cold
+        days = await self.db.run_sync(working_day_calendar.between, date_from, date_to)
+        return build_calendar(days, date_from, date_to)
+
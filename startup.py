@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import os
+import time
+from sqlalchemy import text
+from database import engine, async_engine, AsyncSessionLocal, SessionLocal, db_url
+import database_models
+
+logger = logging.getLogger(__name__)
+
+# Dev convenience only, the schema is managed by alembic
+DB_CREATE_ALL = os.getenv("DB_CREATE_ALL", "false").lower() in ("1", "true", "yes")
+# "strict" refuses to start on a schema that is not at the alembic head, "warn" logs it, "off" skips the check
+STARTUP_SCHEMA_CHECK = os.getenv("STARTUP_SCHEMA_CHECK", "warn").lower()
+# Connections opened per engine before the first request, defaults to the pool size
+STARTUP_WARM_CONNECTIONS = int(os.getenv("STARTUP_WARM_CONNECTIONS", os.getenv("DB_POOL_SIZE", "5")))
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+def check_schema_version():
+    """Compare the database's alembic revision with the head of alembic/versions"""
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "alembic"))
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    with engine.connect() as conn:
+        current = set(MigrationContext.configure(conn).get_current_heads())
+
+    if current != heads:
+        message = (f"Database schema is at {', '.join(sorted(current)) or 'no revision'}, "
+                   f"code expects {', '.join(sorted(heads))}; run 'alembic upgrade head'")
+        if STARTUP_SCHEMA_CHECK == "strict":
+            raise SchemaVersionError(message)
+        logger.warning(message)
+
+def warm_sync_pool():
+    # Checked out together so the pool really holds that many connections afterwards
+    connections = [engine.connect() for _ in range(STARTUP_WARM_CONNECTIONS)]
+    for conn in connections:
+        conn.execute(text("SELECT 1"))
+        conn.close()
+
+async def warm_async_pool():
+    connections = await asyncio.gather(*[async_engine.connect() for _ in range(STARTUP_WARM_CONNECTIONS)])
+    for conn in connections:
+        await conn.execute(text("SELECT 1"))
+        await conn.close()
+
+async def preload_items():
+    from models import Item
+    from services.item_service import AsyncItemService
+    from utils.http_cache import response_cache
+
+    async with AsyncSessionLocal() as db:
+        await response_cache.warm("items", "/items/", list[Item], lambda: AsyncItemService(db).get_all(expand=set()))
+
+async def preload_calendar():
+    from services.working_day_calendar import working_day_calendar
+
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(working_day_calendar.snapshot)
+
+def ensure_partitions():
+    from services.partition_service import PartitionService
+
+    with SessionLocal() as db:
+        created = PartitionService(db).ensure_partitions()
+        db.commit()
+    if created:
+        logger.info("Created partitions %s", ", ".join(created))
+
+async def _timed(name: str, timings: dict, step):
+    start = time.perf_counter()
+    try:
+        if asyncio.iscoroutinefunction(step):
+            await step()
+        else:
+            await asyncio.to_thread(step)
+    finally:
+        timings[name] = (time.perf_counter() - start) * 1000
+
+async def run_startup(import_started: float):
+    """Everything the app needs before serving, without DDL unless DB_CREATE_ALL is set"""
+    started = time.perf_counter()
+    timings = {}
+
+    if DB_CREATE_ALL:
+        await _timed("create_all", timings, lambda: database_models.Base.metadata.create_all(bind=engine))
+
+    # create_all databases are not under alembic control. The check runs alone
+    # and first, so nothing else queries or alters a schema it rejects
+    if STARTUP_SCHEMA_CHECK != "off" and not DB_CREATE_ALL:
+        await _timed("schema_check", timings, check_schema_version)
+
+    steps = {
+        "warm_sync_pool": warm_sync_pool,
+        "warm_async_pool": warm_async_pool,
+        "preload_items": preload_items,
+        "preload_calendar": preload_calendar,
+    }
+    # Tables from create_all are plain, only alembic databases have partitions to keep ready
+    if db_url.startswith("postgresql") and not DB_CREATE_ALL:
+        steps["ensure_partitions"] = ensure_partitions
+    await asyncio.gather(*[_timed(name, timings, step) for name, step in steps.items()])
+
+    now = time.perf_counter()
+    logger.info(
+        "Startup finished in %.1f ms (import %.1f ms, startup %.1f ms: %s)",
+        (now - import_started) * 1000, (started - import_started) * 1000, (now - started) * 1000,
+        ", ".join(f"{name} {ms:.1f} ms" for name, ms in timings.items())
+    )
+    return timings
@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+# database.py reads the URL at import, every app module below must come after this
+_db_dir = tempfile.mkdtemp(prefix="bakery-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ.setdefault("EXPORT_DIR", os.path.join(_db_dir, "exports"))
+
+import pytest
+from fastapi.testclient import TestClient
+import database
+import database_models
+import main
+from services.analytics_service import analytics_cache
+from services.auth_service import principal_cache
+from services.rate_resolver import rate_cache
+from services.working_day_calendar import working_day_calendar
+from utils.http_cache import MemoryCacheBackend, RESPONSE_CACHE_MAX_ENTRIES, response_cache
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    """Fresh tables and empty process caches for every test"""
+    database_models.Base.metadata.drop_all(bind=database.engine)
+    database_models.Base.metadata.create_all(bind=database.engine)
+    working_day_calendar.invalidate()
+    rate_cache.invalidate()
+    principal_cache.clear()
+    analytics_cache.clear()
+    response_cache.backend = MemoryCacheBackend(RESPONSE_CACHE_MAX_ENTRIES)
+    yield
+
+@pytest.fixture
+def db():
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+@pytest.fixture
+def admin_headers(client, db):
+    db.add(database_models.User(name="admin", role=database_models.UserRole.ADMIN))
+    db.commit()
+    token = client.post("/auth/login", json={"name": "admin"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,39 @@
+from datetime import date, datetime, timezone
+from sqlalchemy import update
+import database_models
+
+def test_demand_cache_follows_changes_made_by_other_workers(client, db, admin_headers):
+    item = database_models.Item(name="rye")
+    db.add(item)
+    db.flush()
+    for day in (date(2031, 1, 6), date(2031, 1, 7)):
+        db.add(database_models.WorkingDay(
+            date=day,
+            status=database_models.WorkingDayStatus.CLOSE,
+            summarized_at=datetime(2031, 1, 8, tzinfo=timezone.utc)
+        ))
+        db.add(database_models.DailyItemTotal(item_id=item.id, date=day, produced_quantity=10, assigned_quantity=5))
+    db.commit()
+    params = {"from": "2031-01-06", "to": "2031-01-07"}
+    
+    response = client.get("/analytics/demand", params=params, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["items"][0]["assigned_quantity"] == 10
+    
+    # Another worker reopens a day, changes it and closes it again, then renames the item
+    db.execute(
+        update(database_models.DailyItemTotal)
+        .where(database_models.DailyItemTotal.date == date(2031, 1, 7))
+        .values(assigned_quantity=8)
+    )
+    db.execute(
+        update(database_models.WorkingDay)
+        .where(database_models.WorkingDay.date == date(2031, 1, 7))
+        .values(summarized_at=datetime(2031, 1, 9, tzinfo=timezone.utc))
+    )
+    db.execute(update(database_models.Item).where(database_models.Item.id == item.id).values(name="dark rye"))
+    db.commit()
+    
+    line = client.get("/analytics/demand", params=params, headers=admin_headers).json()["items"][0]
+    assert line["assigned_quantity"] == 13
+    assert line["item_name"] == "dark rye"
@@ -0,0 +1,44 @@
+from sqlalchemy import event
+import database
+import database_models
+from utils.cache import TTLCache
+
+def test_principals_are_cached_until_the_user_changes(client, db, admin_headers):
+    db.add(database_models.User(name="deli", role=database_models.UserRole.CUSTOMER))
+    db.commit()
+    customer = db.query(database_models.User).filter_by(name="deli").one()
+    token = client.post("/auth/login", json={"name": "deli"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/admin/pool", headers=headers).status_code == 403
+    
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        assert client.get("/admin/pool", headers=headers).status_code == 403
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+    assert not [statement for statement in statements if "FROM users" in statement]
+    
+    # A role change drops the cached principal
+    response = client.put(f"/users/{customer.id}", json={"role": "admin"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert client.get("/admin/pool", headers=headers).status_code == 200
+
+def test_bad_tokens_are_rejected(client):
+    response = client.get("/admin/pool", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
+
+def test_ttl_cache_expires_and_evicts():
+    cache = TTLCache(ttl_seconds=None, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    
+    cache.set("d", 4, ttl_seconds=0)
+    assert cache.get("d", "gone") == "gone"
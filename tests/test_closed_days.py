@@ -0,0 +1,62 @@
+from datetime import date
+from sqlalchemy import update
+import database_models
+
+def test_writes_to_a_day_closed_by_another_worker_are_rejected(client, db, admin_headers):
+    customer = database_models.User(name="deli", role=database_models.UserRole.CUSTOMER)
+    item = database_models.Item(name="bagel")
+    day = database_models.WorkingDay(date=date(2031, 6, 3), status=database_models.WorkingDayStatus.OPEN)
+    db.add_all([customer, item, day])
+    db.commit()
+    line = {"customer_id": customer.id, "item_id": item.id, "quantity": 3, "assignment_date": "2031-06-03"}
+    
+    # The first write loads the calendar with the day still open
+    assert client.post("/stock-assignments/", json=line, headers=admin_headers).status_code == 201
+    
+    # Another worker closes the day, this process' calendar still has it open
+    db.execute(
+        update(database_models.WorkingDay)
+        .where(database_models.WorkingDay.id == day.id)
+        .values(status=database_models.WorkingDayStatus.CLOSE)
+    )
+    db.commit()
+    
+    response = client.post("/stock-assignments/", json=line, headers=admin_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Working day 2031-06-03 is closed"
+    
+    results = client.post("/stock-assignments/bulk", json=[line], headers=admin_headers).json()
+    assert results[0]["error"] == "Working day 2031-06-03 is closed"
+    
+    production = {"item_id": item.id, "quantity": 10, "production_date": "2031-06-03"}
+    assert client.post("/production/", json=production, headers=admin_headers).status_code == 400
+
+def test_updates_and_deletes_on_a_day_closed_by_another_worker_are_rejected(client, db, admin_headers):
+    item = database_models.Item(name="rye")
+    customer = database_models.User(name="deli", role=database_models.UserRole.CUSTOMER)
+    db.add_all([item, customer, database_models.WorkingDay(date=date(2031, 6, 4), status=database_models.WorkingDayStatus.OPEN)])
+    db.commit()
+    line = {"customer_id": customer.id, "item_id": item.id, "quantity": 3, "assignment_date": "2031-06-04"}
+    assignment = client.post("/stock-assignments/", json=line, headers=admin_headers).json()
+    production = client.post(
+        "/production/", json={"item_id": item.id, "quantity": 10, "production_date": "2031-06-04"}, headers=admin_headers
+    ).json()
+    
+    db.execute(
+        update(database_models.WorkingDay)
+        .where(database_models.WorkingDay.date == date(2031, 6, 4))
+        .values(status=database_models.WorkingDayStatus.CLOSE)
+    )
+    db.commit()
+    
+    for response in (
+        client.put(f"/stock-assignments/{assignment['id']}", json={"quantity": 5}, headers=admin_headers),
+        client.delete(f"/stock-assignments/{assignment['id']}", headers=admin_headers),
+        client.put(f"/production/{production['id']}", json={"quantity": 12}, headers=admin_headers),
+        client.delete(f"/production/{production['id']}", headers=admin_headers),
+    ):
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Working day 2031-06-04 is closed"
+    
+    totals = db.query(database_models.DailyItemTotal).one()
+    assert (totals.assigned_quantity, totals.produced_quantity) == (3, 10)
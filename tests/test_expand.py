@@ -0,0 +1,31 @@
+from datetime import date
+import database_models
+
+def test_lists_are_flat_unless_expanded(client, db, admin_headers):
+    customer = database_models.User(name="deli", role=database_models.UserRole.CUSTOMER)
+    item = database_models.Item(name="bagel")
+    db.add_all([customer, item])
+    db.flush()
+    rate = database_models.SalesRate(customer_id=customer.id, item_id=item.id, rate=2.0, effective_from=date(2031, 5, 1))
+    db.add(rate)
+    db.flush()
+    db.add(database_models.StockAssignment(
+        customer_id=customer.id, item_id=item.id, quantity=3, assignment_date=date(2031, 5, 2), sales_rate_id=rate.id
+    ))
+    db.commit()
+    
+    line = client.get("/stock-assignments/", headers=admin_headers).json()["items"][0]
+    assert (line["customer"], line["item"], line["created_by_user"]) == (None, None, None)
+    # The flat sales rate is always there, the price depends on it
+    assert (line["rate"], line["total_price"]) == (2.0, 6.0)
+    
+    line = client.get("/stock-assignments/", params={"expand": "customer,item"}, headers=admin_headers).json()["items"][0]
+    assert (line["customer"]["name"], line["item"]["name"], line["created_by_user"]) == ("deli", "bagel", None)
+    
+    detail = client.get(f"/stock-assignments/{line['id']}", params={"expand": "item"}, headers=admin_headers).json()
+    assert (detail["customer"], detail["item"]["name"]) == (None, "bagel")
+
+def test_unknown_expansions_are_rejected(client, admin_headers):
+    response = client.get("/stock-assignments/", params={"expand": "customer,nope"}, headers=admin_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cannot expand nope, allowed: created_by_user, customer, item"
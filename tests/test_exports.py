@@ -0,0 +1,7 @@
+import pytest
+
+@pytest.mark.parametrize("dataset", ["stock-assignments", "production"])
+def test_export_rejects_reversed_range(client, admin_headers, dataset):
+    response = client.get(f"/export/{dataset}", params={"from": "2031-02-01", "to": "2031-01-01"}, headers=admin_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "'to' must not be before 'from'"
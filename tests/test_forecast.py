@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import select
+import database_models
+
+FIRST_DAY = date(2031, 3, 1)
+
+def _state(db):
+    db.expire_all()
+    return {
+        row.item_id: (row.level, row.trend, row.weekday_profile, row.through_date)
+        for row in db.scalars(select(database_models.ForecastState))
+    }
+
+def test_incremental_closes_match_a_full_refit(client, db, admin_headers):
+    items = [database_models.Item(name=name) for name in ("white", "rye")]
+    db.add_all(items)
+    db.flush()
+    for offset in range(21):
+        day = FIRST_DAY + timedelta(days=offset)
+        for index, item in enumerate(items):
+            if index and offset < 5:
+                continue  # rye only starts selling on day 5
+            produced = 40 + 10 * index
+            assigned = min(produced, 20 + offset + 5 * day.weekday() + 3 * index)
+            db.add(database_models.DailyItemTotal(item_id=item.id, date=day, produced_quantity=produced, assigned_quantity=assigned))
+    db.commit()
+    
+    days = client.post("/working-days/bulk", json={"year": 2031, "month": 3}, headers=admin_headers).json()
+    for day in days[:21]:
+        response = client.put(f"/working-days/{day['id']}", json={"status": "close"}, headers=admin_headers)
+        assert response.status_code == 200
+    
+    incremental_state = _state(db)
+    incremental = client.get("/production/forecast", headers=admin_headers).json()
+    assert [line["forecast_date"] for line in incremental] == ["2031-03-22", "2031-03-22"]
+    
+    run = client.post("/production/forecast/run", params={"full": "true"}, headers=admin_headers).json()
+    assert run["days_processed"] == 21
+    assert run["through_date"] == "2031-03-21"
+    full_state = _state(db)
+    full = client.get("/production/forecast", headers=admin_headers).json()
+    
+    assert full_state.keys() == incremental_state.keys()
+    for item_id, (level, trend, profile, through) in full_state.items():
+        incremental_level, incremental_trend, incremental_profile, incremental_through = incremental_state[item_id]
+        assert level == pytest.approx(incremental_level)
+        assert trend == pytest.approx(incremental_trend)
+        assert profile == pytest.approx(incremental_profile)
+        assert through == incremental_through
+    assert [line["quantity"] for line in full] == [line["quantity"] for line in incremental]
+    assert [line["expected"] for line in full] == pytest.approx([line["expected"] for line in incremental])
+
+def test_full_refit_without_closed_days_clears_the_state(client, db, admin_headers):
+    item = database_models.Item(name="spelt")
+    db.add(item)
+    db.flush()
+    db.add(database_models.ForecastState(
+        item_id=item.id, level=12.0, trend=0.5, weekday_profile=[0.0] * 7, through_date=FIRST_DAY
+    ))
+    db.commit()
+    
+    run = client.post("/production/forecast/run", params={"full": "true"}, headers=admin_headers).json()
+    assert run["through_date"] is None
+    assert _state(db) == {}
@@ -0,0 +1,42 @@
+from datetime import date
+from sqlalchemy import update
+import database_models
+
+def test_catalog_responses_revalidate_with_etags(client, db, admin_headers):
+    client.post("/items/", json={"name": "bagel"}, headers=admin_headers)
+    
+    first = client.get("/items/")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert client.get("/items/", headers={"If-None-Match": etag}).status_code == 304
+    
+    # Served from the cache, a change behind the service's back goes unseen
+    db.execute(update(database_models.Item).values(name="renamed"))
+    db.commit()
+    assert client.get("/items/").json()[0]["name"] == "bagel"
+    
+    # Writes through the service invalidate the namespace
+    client.post("/items/", json={"name": "rye"}, headers=admin_headers)
+    second = client.get("/items/", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != etag
+    assert [item["name"] for item in second.json()] == ["renamed", "rye"]
+
+def test_missing_rows_are_not_cached(client, admin_headers):
+    assert client.get("/items/1").status_code == 404
+    client.post("/items/", json={"name": "bagel"}, headers=admin_headers)
+    assert client.get("/items/1").json()["name"] == "bagel"
+
+def test_dashboard_is_invalidated_by_new_assignments(client, db, admin_headers):
+    db.add_all([database_models.User(name="deli", role=database_models.UserRole.CUSTOMER), database_models.Item(name="bagel")])
+    db.commit()
+    customer = db.query(database_models.User).filter_by(name="deli").one()
+    item = db.query(database_models.Item).one()
+    token = client.post("/auth/login", json={"name": "deli"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/me/dashboard", headers=headers).json()["total_quantity"] == 0
+    
+    line = {"customer_id": customer.id, "item_id": item.id, "quantity": 5, "assignment_date": str(date.today())}
+    assert client.post("/stock-assignments/", json=line, headers=admin_headers).status_code == 201
+    assert client.get("/me/dashboard", headers=headers).json()["total_quantity"] == 5
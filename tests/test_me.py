@@ -0,0 +1,42 @@
+from datetime import date, timedelta
+import database_models
+
+def _login(client, db, name):
+    db.add(database_models.User(name=name, role=database_models.UserRole.CUSTOMER))
+    db.commit()
+    token = client.post("/auth/login", json={"name": name}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+def test_me_is_scoped_to_the_caller(client, db, admin_headers):
+    headers = _login(client, db, "deli")
+    other = database_models.User(name="cafe", role=database_models.UserRole.CUSTOMER)
+    item = database_models.Item(name="bagel")
+    db.add_all([other, item])
+    db.commit()
+    customer = db.query(database_models.User).filter_by(name="deli").one()
+    today = date.today()
+    client.post("/sales-rates/", json={
+        "customer_id": customer.id, "item_id": item.id, "rate": 2.0, "effective_from": str(today - timedelta(days=60))
+    }, headers=admin_headers)
+    lines = [
+        {"customer_id": customer_id, "item_id": item.id, "quantity": quantity, "assignment_date": str(today)}
+        for customer_id, quantity in ((customer.id, 4), (other.id, 9))
+    ]
+    assert client.post("/stock-assignments/bulk", json=lines, headers=admin_headers).status_code == 201
+    
+    assignments = client.get("/me/stock-assignments", headers=headers).json()["items"]
+    assert [(line["customer_id"], line["quantity"]) for line in assignments] == [(customer.id, 4)]
+    assert [rate["customer_id"] for rate in client.get("/me/sales-rates", headers=headers).json()["items"]] == [customer.id]
+    
+    dashboard = client.get("/me/dashboard", headers=headers).json()
+    assert (dashboard["customer_id"], dashboard["total_quantity"], dashboard["total_amount"]) == (customer.id, 4, 8.0)
+
+def test_deleted_users_lose_access_to_me(client, db, admin_headers):
+    headers = _login(client, db, "deli")
+    assert client.get("/me/dashboard", headers=headers).status_code == 200
+    
+    customer = db.query(database_models.User).filter_by(name="deli").one()
+    assert client.delete(f"/users/{customer.id}", headers=admin_headers).status_code == 204
+    
+    for path in ("/me/stock-assignments", "/me/sales-rates", "/me/dashboard"):
+        assert client.get(path, headers=headers).status_code == 401
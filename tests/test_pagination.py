@@ -0,0 +1,60 @@
+from datetime import date
+import database_models
+
+def _pages(client, path, params, headers):
+    rows, cursor = [], None
+    while True:
+        body = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers).json()
+        rows += body["items"]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return rows
+
+def test_keyset_pages_walk_every_row_once_newest_first(client, db, admin_headers):
+    customers = [database_models.User(name=name, role=database_models.UserRole.CUSTOMER) for name in ("deli", "cafe")]
+    item = database_models.Item(name="bagel")
+    db.add_all([*customers, item])
+    db.flush()
+    days = [date(2031, 5, 1), date(2031, 5, 2), date(2031, 5, 2), date(2031, 5, 2), date(2031, 5, 3), date(2031, 5, 4), date(2031, 5, 4)]
+    for index, day in enumerate(days):
+        db.add(database_models.StockAssignment(
+            customer_id=customers[index % 2].id, item_id=item.id, quantity=index + 1, assignment_date=day
+        ))
+        db.add(database_models.Production(item_id=item.id, quantity=index + 1, production_date=day))
+    db.commit()
+    
+    rows = _pages(client, "/stock-assignments/", {"limit": 3}, admin_headers)
+    assert [(row["assignment_date"], row["id"]) for row in rows] == sorted(
+        ((row["assignment_date"], row["id"]) for row in rows), reverse=True
+    )
+    assert len({row["id"] for row in rows}) == len(days)
+    
+    filtered = _pages(client, "/stock-assignments/", {
+        "limit": 2, "customer_id": customers[0].id, "from": "2031-05-02", "to": "2031-05-03"
+    }, admin_headers)
+    assert [(row["customer_id"], row["assignment_date"]) for row in filtered] == [
+        (customers[0].id, "2031-05-03"), (customers[0].id, "2031-05-02")
+    ]
+    
+    production = _pages(client, "/production/", {"limit": 4}, admin_headers)
+    assert [row["quantity"] for row in production] == [7, 6, 5, 4, 3, 2, 1]
+
+def test_sales_rates_page_on_effective_from(client, db, admin_headers):
+    customer = database_models.User(name="deli", role=database_models.UserRole.CUSTOMER)
+    items = [database_models.Item(name=f"item {index}") for index in range(5)]
+    db.add_all([customer, *items])
+    db.flush()
+    for index, item in enumerate(items):
+        db.add(database_models.SalesRate(
+            customer_id=customer.id, item_id=item.id, rate=1.0 + index, effective_from=date(2031, 1, 1 + index % 3)
+        ))
+    db.commit()
+    
+    rows = _pages(client, "/sales-rates/", {"limit": 2}, admin_headers)
+    assert [row["effective_from"] for row in rows] == ["2031-01-03", "2031-01-02", "2031-01-02", "2031-01-01", "2031-01-01"]
+    assert len({row["id"] for row in rows}) == 5
+
+def test_invalid_cursor_is_rejected(client, admin_headers):
+    response = client.get("/stock-assignments/", params={"cursor": "not-a-cursor"}, headers=admin_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,55 @@
+from datetime import date
+from functools import partial
+import pytest
+import database_models
+from routers import exports
+from services import parquet_export_service
+from services.parquet_export_service import ParquetExportService
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+def test_parquet_runs_write_one_file_per_month(client, db, admin_headers, tmp_path, monkeypatch):
+    monkeypatch.setattr(exports, "ParquetExportService", partial(ParquetExportService, export_dir=str(tmp_path)))
+    customer = database_models.User(name="deli", role=database_models.UserRole.CUSTOMER)
+    item = database_models.Item(name="bagel")
+    db.add_all([customer, item])
+    db.flush()
+    rate = database_models.SalesRate(customer_id=customer.id, item_id=item.id, rate=2.0, effective_from=date(2031, 5, 1))
+    db.add(rate)
+    db.flush()
+    for day, quantity, rate_id in ((date(2031, 5, 2), 3, rate.id), (date(2031, 5, 9), 1, None), (date(2031, 6, 1), 4, rate.id)):
+        db.add(database_models.StockAssignment(
+            customer_id=customer.id, item_id=item.id, quantity=quantity, assignment_date=day, sales_rate_id=rate_id
+        ))
+    db.commit()
+    
+    run = client.post("/export/parquet/stock_assignments", params={"full": "true"}, headers=admin_headers).json()
+    assert (run["months"], run["rows"], run["full"]) == (["2031-05", "2031-06"], 3, True)
+    table = pq.read_table(tmp_path / "stock_assignments" / "month=2031-05" / "part.parquet")
+    assert table.column("customer_name").to_pylist() == ["deli", "deli"]
+    assert sorted(table.column("total_price").to_pylist()) == [0.0, 6.0]
+    assert not [path for path in tmp_path.rglob("*.tmp")]
+    
+    response = client.get("/export/parquet/stock_assignments/2031-06", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    assert client.get("/export/parquet/stock_assignments/2031-07", headers=admin_headers).status_code == 404
+    assert client.get("/export/parquet/stock_assignments/..%2F..", headers=admin_headers).status_code == 404
+    
+    # A full run drops the file of a month that no longer has rows
+    db.query(database_models.StockAssignment).filter_by(assignment_date=date(2031, 6, 1)).delete()
+    db.commit()
+    client.post("/export/parquet/stock_assignments", params={"full": "true"}, headers=admin_headers)
+    files = client.get("/export/parquet", headers=admin_headers).json()
+    assert [(entry["dataset"], entry["month"]) for entry in files] == [("stock_assignments", "2031-05")]
+
+def test_only_one_run_per_dataset_at_a_time(client, admin_headers, tmp_path, monkeypatch):
+    monkeypatch.setattr(exports, "ParquetExportService", partial(ParquetExportService, export_dir=str(tmp_path)))
+    lock = parquet_export_service._run_locks["production"]
+    lock.acquire()
+    try:
+        response = client.post("/export/parquet/production", headers=admin_headers)
+    finally:
+        lock.release()
+    assert response.status_code == 409
+    assert client.post("/export/parquet/production", headers=admin_headers).status_code == 200
@@ -0,0 +1,22 @@
+from datetime import date
+from services import partition_service
+from services.partition_service import PartitionService, add_months, partition_name, partitioned_tables
+
+def test_partition_layout_helpers():
+    assert partitioned_tables() == {"stock_assignments": "assignment_date", "production": "production_date"}
+    assert add_months(date(2031, 11, 1), 3) == date(2032, 2, 1)
+    assert add_months(date(2031, 1, 1), -1) == date(2030, 12, 1)
+    assert partition_name("production", date(2031, 2, 1)) == "production_p2031_02"
+
+def test_plain_tables_are_left_alone(db):
+    assert PartitionService(db).ensure_partitions(through=date(2031, 6, 30)) == []
+    assert PartitionService(db).list_partitions("stock_assignments") == []
+
+def test_planning_a_month_creates_no_partitions(client, admin_headers, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("partitions are created at startup and by manage_partitions only")
+    
+    monkeypatch.setattr(partition_service.PartitionService, "ensure_partitions", fail)
+    response = client.post("/working-days/bulk", json={"year": 2031, "month": 9}, headers=admin_headers)
+    assert response.status_code == 201
+    assert len(response.json()) == 30
@@ -0,0 +1,38 @@
+import sqlite3
+import pytest
+from sqlalchemy import exc
+import database
+import database_models
+from utils.pool_metrics import InstrumentedQueuePool, PoolMetrics
+
+def test_pool_options_come_from_the_environment(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "12")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "yes")
+    options = database.pool_options("postgresql://db/bakery", InstrumentedQueuePool)
+    assert (options["pool_size"], options["pool_pre_ping"], options["poolclass"]) == (12, True, InstrumentedQueuePool)
+    assert database.pool_options("sqlite:///bakery.db", InstrumentedQueuePool) == {}
+    assert database.to_async_url("postgresql://db/bakery") == "postgresql+asyncpg://db/bakery"
+    assert database.to_async_url("sqlite:///bakery.db") == "sqlite+aiosqlite:///bakery.db"
+
+def test_checkouts_and_timeouts_are_counted(monkeypatch):
+    monkeypatch.setattr(InstrumentedQueuePool, "metrics", PoolMetrics())
+    pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.01)
+    connection = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    
+    stats = pool.metrics.snapshot(pool)
+    assert (stats["checkouts"], stats["timeouts"], stats["checked_out"]) == (1, 1, 1)
+    assert stats["checkout_seconds_histogram"]["+Inf"] == 1
+    connection.close()
+    assert pool.metrics.snapshot(pool)["checked_in"] == 1
+
+def test_pool_stats_are_admin_only(client, db, admin_headers):
+    db.add(database_models.User(name="deli", role=database_models.UserRole.CUSTOMER))
+    db.commit()
+    token = client.post("/auth/login", json={"name": "deli"}).json()["access_token"]
+    assert client.get("/admin/pool", headers={"Authorization": f"Bearer {token}"}).status_code == 403
+    
+    response = client.get("/admin/pool", headers=admin_headers)
+    assert response.status_code == 200
+    assert set(response.json()) == {"sync", "async"}
@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import exc, text
+import database
+import database_models
+from routers import metrics
+
+def test_requests_report_their_queries(client, admin_headers):
+    response = client.get("/stock-assignments/", headers=admin_headers)
+    assert response.status_code == 200
+    assert 'desc="' in response.headers["server-timing"]
+    
+    body = client.get("/metrics", headers=admin_headers).text
+    assert 'bakery_http_requests_total{method="GET",route="/stock-assignments/"}' in body
+    assert 'bakery_db_queries_total{method="GET",route="/stock-assignments/"}' in body
+
+def test_failed_statements_do_not_leave_timings_behind():
+    with database.engine.connect() as connection:
+        with pytest.raises(exc.OperationalError):
+            connection.execute(text("SELECT * FROM no_such_table"))
+        assert connection.info["query_start"] == []
+        connection.execute(text("SELECT 1"))
+        assert connection.info["query_start"] == []
+
+def test_metrics_need_an_admin_or_the_scraper_token(client, db, admin_headers, monkeypatch):
+    assert client.get("/metrics").status_code == 401
+    db.add(database_models.User(name="deli", role=database_models.UserRole.CUSTOMER))
+    db.commit()
+    token = client.post("/auth/login", json={"name": "deli"}).json()["access_token"]
+    assert client.get("/metrics", headers={"Authorization": f"Bearer {token}"}).status_code == 403
+    
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
@@ -0,0 +1,70 @@
+from datetime import date
+import database_models
+
+def _setup(client, db, admin_headers):
+    customer = database_models.User(name="deli", role=database_models.UserRole.CUSTOMER)
+    items = [database_models.Item(name="bagel"), database_models.Item(name="rye")]
+    db.add_all([customer, *items])
+    db.commit()
+    client.post("/sales-rates/batch", json=[
+        {"customer_id": customer.id, "item_id": items[0].id, "rate": 2.0, "effective_from": "2031-05-01"},
+        {"customer_id": customer.id, "item_id": items[1].id, "rate": 3.0, "effective_from": "2031-05-01"},
+    ], headers=admin_headers)
+    client.post("/sales-rates/batch", json=[
+        {"customer_id": customer.id, "item_id": items[0].id, "rate": 2.5, "effective_from": "2031-05-03"},
+    ], headers=admin_headers)
+    lines = [
+        (items[0].id, 4, "2031-05-02"),
+        (items[0].id, 1, "2031-05-02"),
+        (items[1].id, 2, "2031-05-02"),
+        (items[0].id, 6, "2031-05-03"),
+    ]
+    response = client.post("/stock-assignments/bulk", json=[
+        {"customer_id": customer.id, "item_id": item_id, "quantity": quantity, "assignment_date": day}
+        for item_id, quantity, day in lines
+    ], headers=admin_headers)
+    assert all(result["error"] is None for result in response.json())
+    return customer, items
+
+def test_customer_statement_groups_quantity_and_amount_per_day_item_and_rate(client, db, admin_headers):
+    customer, items = _setup(client, db, admin_headers)
+    
+    response = client.get("/reports/customer-statement", params={
+        "customer_id": customer.id, "from": "2031-05-01", "to": "2031-05-31"
+    }, headers=admin_headers)
+    assert response.status_code == 200
+    statement = response.json()
+    assert [(line["date"], line["item_name"], line["quantity"], line["rate"], line["amount"]) for line in statement["lines"]] == [
+        ("2031-05-02", "bagel", 5, 2.0, 10.0),
+        ("2031-05-02", "rye", 2, 3.0, 6.0),
+        ("2031-05-03", "bagel", 6, 2.5, 15.0),
+    ]
+    assert (statement["total_quantity"], statement["total_amount"]) == (13, 31.0)
+    
+    response = client.get("/reports/customer-statement", params={
+        "customer_id": customer.id, "from": "2031-05-31", "to": "2031-05-01"
+    }, headers=admin_headers)
+    assert response.status_code == 400
+
+def test_reconciliation_matches_the_incremental_totals(client, db, admin_headers):
+    customer, items = _setup(client, db, admin_headers)
+    for item, quantity, day in ((items[0], 12, "2031-05-02"), (items[0], 3, "2031-05-03"), (items[1], 8, "2031-05-04")):
+        response = client.post("/production/", json={"item_id": item.id, "quantity": quantity, "production_date": day}, headers=admin_headers)
+        assert response.status_code == 201
+    params = {"from": "2031-05-01", "to": "2031-05-31"}
+    
+    lines = client.get("/reports/reconciliation", params=params, headers=admin_headers).json()
+    assert [
+        (line["date"], line["item_name"], line["produced_quantity"], line["assigned_quantity"], line["leftover_quantity"])
+        for line in lines
+    ] == [
+        ("2031-05-02", "bagel", 12, 5, 7),
+        ("2031-05-02", "rye", 0, 2, -2),
+        ("2031-05-03", "bagel", 3, 6, -3),
+        ("2031-05-04", "rye", 8, 0, 8),
+    ]
+    assert client.get("/reports/reconciliation", params={**params, "incremental": "true"}, headers=admin_headers).json() == lines
+    
+    one_day = client.get("/reports/reconciliation", params={"date": "2031-05-03"}, headers=admin_headers).json()
+    assert one_day == [line for line in lines if line["date"] == "2031-05-03"]
+    assert client.get("/reports/reconciliation", params={"from": "2031-05-01"}, headers=admin_headers).status_code == 400
@@ -0,0 +1,69 @@
+from datetime import date
+import database_models
+from services.rate_resolver import RateCache, SalesRateResolver
+
+def _customer_and_item(db):
+    customer = database_models.User(name="cafe", role=database_models.UserRole.CUSTOMER)
+    item = database_models.Item(name="croissant")
+    db.add_all([customer, item])
+    db.commit()
+    return customer, item
+
+def test_dates_before_a_price_change_keep_the_old_rate(client, db, admin_headers):
+    customer, item = _customer_and_item(db)
+    rate = {"customer_id": customer.id, "item_id": item.id}
+    old = client.post("/sales-rates/batch", json=[{**rate, "rate": 2.0, "effective_from": "2031-03-01"}], headers=admin_headers).json()[0]
+    new = client.post("/sales-rates/batch", json=[{**rate, "rate": 2.5, "effective_from": "2031-04-01"}], headers=admin_headers).json()[0]
+    
+    lookups = [
+        {**rate, "target_date": "2031-03-15"},
+        {**rate, "target_date": "2031-04-01"},
+        {**rate, "target_date": "2031-02-28"},
+    ]
+    results = client.post("/sales-rates/resolve", json=lookups).json()
+    assert [result["sales_rate_id"] for result in results] == [old["id"], new["id"], None]
+    assert [result["rate"] for result in results] == [2.0, 2.5, None]
+
+def test_rate_history_expires_after_the_ttl(db):
+    customer, item = _customer_and_item(db)
+    cache = RateCache(ttl_seconds=0)
+    key = (customer.id, item.id, date(2031, 3, 15))
+    assert SalesRateResolver(db, cache).resolve_many([key])[key] is None
+    
+    # Added by another worker, this cache was never invalidated
+    db.add(database_models.SalesRate(customer_id=customer.id, item_id=item.id, rate=2.0, effective_from=date(2031, 3, 1)))
+    db.commit()
+    assert SalesRateResolver(db, cache).resolve_many([key])[key].rate == 2.0
+
+def test_price_list_closes_the_rates_it_replaces(client, db, admin_headers):
+    customer, item = _customer_and_item(db)
+    other_item = database_models.Item(name="brioche")
+    db.add(other_item)
+    db.commit()
+    rate = {"customer_id": customer.id, "item_id": item.id}
+    old = client.post("/sales-rates/batch", json=[
+        {**rate, "rate": 2.0, "effective_from": "2031-03-01"},
+        {"customer_id": customer.id, "item_id": other_item.id, "rate": 4.0, "effective_from": "2031-03-01"},
+    ], headers=admin_headers).json()
+    key = {**rate, "target_date": "2031-04-10"}
+    assert client.post("/sales-rates/resolve", json=[key]).json()[0]["rate"] == 2.0
+    
+    response = client.post("/sales-rates/batch", json=[
+        {**rate, "rate": 2.5, "effective_from": "2031-04-01"},
+        {"customer_id": customer.id, "item_id": other_item.id, "rate": 9.0, "effective_from": "2031-04-01", "is_active": False},
+    ], headers=admin_headers)
+    assert response.status_code == 201
+    
+    db.expire_all()
+    replaced, untouched = (db.get(database_models.SalesRate, line["id"]) for line in old)
+    assert (replaced.is_active, replaced.effective_to) == (False, date(2031, 4, 1))
+    assert (untouched.is_active, untouched.effective_to) == (True, None)
+    # The resolver cache was invalidated by the batch
+    assert client.post("/sales-rates/resolve", json=[key]).json()[0]["rate"] == 2.5
+
+def test_price_list_rejects_repeated_pairs(client, db, admin_headers):
+    customer, item = _customer_and_item(db)
+    line = {"customer_id": customer.id, "item_id": item.id, "rate": 2.0, "effective_from": "2031-03-01"}
+    response = client.post("/sales-rates/batch", json=[line, {**line, "rate": 3.0}], headers=admin_headers)
+    assert response.status_code == 400
+    assert db.query(database_models.SalesRate).count() == 0
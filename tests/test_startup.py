@@ -0,0 +1,20 @@
+import asyncio
+import pytest
+import startup
+
+def test_strict_schema_check_runs_before_other_steps(monkeypatch):
+    ran = []
+    
+    def reject():
+        ran.append("schema_check")
+        raise startup.SchemaVersionError("behind head")
+    
+    monkeypatch.setattr(startup, "STARTUP_SCHEMA_CHECK", "strict")
+    monkeypatch.setattr(startup, "DB_CREATE_ALL", False)
+    monkeypatch.setattr(startup, "check_schema_version", reject)
+    for name in ("warm_sync_pool", "preload_calendar", "ensure_partitions"):
+        monkeypatch.setattr(startup, name, lambda name=name: ran.append(name))
+    
+    with pytest.raises(startup.SchemaVersionError):
+        asyncio.run(startup.run_startup(0.0))
+    assert ran == ["schema_check"]
@@ -0,0 +1,40 @@
+from datetime import date
+import database_models
+
+def test_bulk_reports_bad_lines_and_binds_rates_by_date(client, db, admin_headers):
+    customer = database_models.User(name="deli", role=database_models.UserRole.CUSTOMER)
+    item = database_models.Item(name="bagel")
+    db.add_all([customer, item, database_models.WorkingDay(date=date(2031, 5, 2), status=database_models.WorkingDayStatus.CLOSE)])
+    db.commit()
+    rate = {"customer_id": customer.id, "item_id": item.id}
+    old = client.post("/sales-rates/batch", json=[{**rate, "rate": 2.0, "effective_from": "2031-04-01"}], headers=admin_headers).json()[0]
+    new = client.post("/sales-rates/batch", json=[{**rate, "rate": 2.5, "effective_from": "2031-05-01"}], headers=admin_headers).json()[0]
+    
+    line = {**rate, "quantity": 4, "assignment_date": "2031-05-03"}
+    results = client.post("/stock-assignments/bulk", json=[
+        {**line, "assignment_date": "2031-04-20"},
+        line,
+        {**line, "customer_id": 999},
+        {**line, "item_id": 999},
+        {**line, "sales_rate_id": 999},
+        {**line, "assignment_date": "2031-05-02"},
+        {**line, "sales_rate_id": old["id"]},
+    ], headers=admin_headers)
+    assert results.status_code == 201
+    results = results.json()
+    
+    assert [result["sales_rate_id"] for result in results] == [old["id"], new["id"], None, None, None, None, old["id"]]
+    assert [result["error"] for result in results] == [
+        None,
+        None,
+        "Customer 999 not found",
+        "Item 999 not found",
+        "Sales rate 999 not found",
+        "Working day 2031-05-02 is closed",
+        None,
+    ]
+    assert all(result["id"] for result in results if result["error"] is None)
+    assert db.query(database_models.StockAssignment).count() == 3
+    
+    totals = db.query(database_models.DailyItemTotal).order_by(database_models.DailyItemTotal.date).all()
+    assert [(total.date, total.assigned_quantity) for total in totals] == [(date(2031, 4, 20), 4), (date(2031, 5, 3), 8)]
@@ -0,0 +1,46 @@
+from datetime import date
+import database_models
+
+def test_bulk_create_skips_days_missing_from_cached_calendar(client, db, admin_headers):
+    # Loads the calendar while the month is still empty
+    response = client.get("/working-days/calendar", params={"from": "2031-03-01", "to": "2031-03-31"}, headers=admin_headers)
+    assert response.status_code == 200
+    
+    # Another worker creates a day of that month, this process' calendar does not know it
+    db.add(database_models.WorkingDay(date=date(2031, 3, 10), status=database_models.WorkingDayStatus.OPEN))
+    db.commit()
+    
+    response = client.post("/working-days/bulk", json={"year": 2031, "month": 3}, headers=admin_headers)
+    assert response.status_code == 201
+    created = [day["date"] for day in response.json()]
+    assert len(created) == 30
+    assert "2031-03-10" not in created
+
+def test_days_created_closed_are_summarized(client, db, admin_headers):
+    customer = database_models.User(name="cafe", role=database_models.UserRole.CUSTOMER)
+    item = database_models.Item(name="baguette")
+    db.add_all([customer, item])
+    db.flush()
+    rate = database_models.SalesRate(customer_id=customer.id, item_id=item.id, rate=2.5, effective_from=date(2031, 1, 1))
+    db.add(rate)
+    db.flush()
+    for day in (date(2031, 4, 2), date(2031, 5, 7)):
+        db.add(database_models.StockAssignment(
+            customer_id=customer.id, item_id=item.id, quantity=4, assignment_date=day, sales_rate_id=rate.id
+        ))
+    db.commit()
+    
+    response = client.post("/working-days/", json={"date": "2031-04-02", "status": "close"}, headers=admin_headers)
+    assert response.status_code == 201
+    assert response.json()["summarized_at"] is not None
+    
+    response = client.post("/working-days/bulk", json={"year": 2031, "month": 5, "status": "close"}, headers=admin_headers)
+    assert response.status_code == 201
+    assert all(day["summarized_at"] is not None for day in response.json())
+    
+    params = {"from": "2031-04-01", "to": "2031-05-31"}
+    lines = client.get("/reports/daily-sales", params=params, headers=admin_headers).json()
+    assert [(line["date"], line["quantity"], line["amount"]) for line in lines] == [
+        ("2031-04-02", 4, 10.0),
+        ("2031-05-07", 4, 10.0),
+    ]
@@ -0,0 +1,29 @@
+from sqlalchemy import event
+import database
+import database_models
+
+def test_create_answers_without_reading_the_row_back(client, db, admin_headers):
+    item = database_models.Item(name="rye")
+    db.add(item)
+    db.commit()
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        response = client.post(
+            "/production/", json={"item_id": item.id, "quantity": 10, "production_date": "2031-06-03"}, headers=admin_headers
+        )
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+    
+    assert response.status_code == 201
+    body = response.json()
+    assert body["item"]["name"] == "rye"
+    assert body["created_by_user"]["name"] == "admin"
+    assert not [statement for statement in statements if statement.lstrip().startswith("SELECT") and "FROM production" in statement]
+    
+    db.expire_all()
+    assert db.get(database_models.Production, body["id"]).quantity == 10
@@ -0,0 +1,34 @@
+from typing import Iterable, Mapping, Optional, Set
+from fastapi import HTTPException, status
+from sqlalchemy.orm import noload, selectinload
+
+def parse_expand(expand: Optional[str], allowed: Iterable[str]) -> Set[str]:
+    """Parse ?expand=a,b into a set of relationship names, rejecting unknown ones"""
+    if not expand:
+        return set()
+    requested = {name.strip() for name in expand.split(",") if name.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot expand {', '.join(sorted(unknown))}, allowed: {', '.join(sorted(allowed))}"
+        )
+    return requested
+
+def relationship_options(model, expandable: Iterable[str], expand: Optional[Set[str]] = None, nested: Optional[Mapping] = None):
+    """Loader options that selectin-load the expanded relationships and skip the rest.
+
+    expand=None loads everything, which is what the write paths rely on.
+    Skipped relationships are noloaded so they serialize as null without a query.
+    """
+    options = []
+    for name in expandable:
+        attr = getattr(model, name)
+        if expand is None or name in expand:
+            option = selectinload(attr)
+            for child in (nested or {}).get(name, ()):
+                option = option.selectinload(child)
+            options.append(option)
+        else:
+            options.append(noload(attr))
+    return options
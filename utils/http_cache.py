@@ -0,0 +1,122 @@
+import hashlib
+import os
+import threading
+from typing import Awaitable, Callable, Optional
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+from utils.cache import TTLCache
+
+try:
+    import redis
+except ImportError:  # Only needed when RESPONSE_CACHE_URL points at Redis
+    redis = None
+
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+
+class MemoryCacheBackend:
+    """In-process backend, entries are evicted by TTL and LRU"""
+
+    def __init__(self, max_entries: int):
+        self._entries = TTLCache(ttl_seconds=None, max_entries=max_entries)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float):
+        self._entries.set(key, value, ttl_seconds=ttl_seconds)
+
+    def get_version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+    def bump_version(self, namespace: str):
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+class RedisCacheBackend:
+    """Shared backend so every worker sees the same entries and invalidations"""
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise RuntimeError("RESPONSE_CACHE_URL points at Redis but the redis package is not installed")
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(f"response:{key}")
+
+    def set(self, key: str, value: bytes, ttl_seconds: float):
+        self._client.set(f"response:{key}", value, ex=max(1, int(ttl_seconds)))
+
+    def get_version(self, namespace: str) -> int:
+        return int(self._client.get(f"response-version:{namespace}") or 0)
+
+    def bump_version(self, namespace: str):
+        self._client.incr(f"response-version:{namespace}")
+
+class ResponseCache:
+    """Caches serialized GET responses per namespace with ETag revalidation.
+
+    Entries are keyed by a per-namespace version, so invalidate() just bumps the
+    version and stale entries age out of the backend on their own.
+    """
+
+    def __init__(self, backend, ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._adapters = {}
+
+    def invalidate(self, *namespaces: str):
+        for namespace in namespaces:
+            self.backend.bump_version(namespace)
+
+    def _adapter(self, response_model) -> TypeAdapter:
+        adapter = self._adapters.get(response_model)
+        if adapter is None:
+            adapter = self._adapters[response_model] = TypeAdapter(response_model)
+        return adapter
+
+    def _key(self, namespace: str, path: str, query: str = "", vary: str = "") -> str:
+        query = "&".join(sorted(query.split("&"))) if query else ""
+        return f"{namespace}:{self.backend.get_version(namespace)}:{path}?{query}#{vary}"
+
+    async def _load_entry(self, key: str, response_model, load: Callable[[], Awaitable]) -> bytes:
+        adapter = self._adapter(response_model)
+        result = await load()
+        body = adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        entry = etag.encode() + b"\n" + body
+        self.backend.set(key, entry, self.ttl_seconds)
+        return entry
+
+    async def warm(self, namespace: str, path: str, response_model, load: Callable[[], Awaitable]):
+        """Fill the entry a plain GET of path (no query string) would be served from"""
+        await self._load_entry(self._key(namespace, path), response_model, load)
+
+    async def respond(self, request: Request, namespace: str, response_model, load: Callable[[], Awaitable], vary: str = "") -> Response:
+        """Serve from the cache, or call load() and cache its serialized result.
+
+        vary separates entries of the same URL that depend on something outside
+        it, e.g. the current date.
+        """
+        key = self._key(namespace, request.url.path, request.url.query, vary)
+        entry = self.backend.get(key)
+        if entry is None:
+            entry = await self._load_entry(key, response_model, load)
+        etag_bytes, _, body = entry.partition(b"\n")
+        etag = etag_bytes.decode()
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+def _build_backend():
+    url = os.getenv("RESPONSE_CACHE_URL")
+    if url and url.startswith(("redis://", "rediss://")):
+        return RedisCacheBackend(url)
+    return MemoryCacheBackend(RESPONSE_CACHE_MAX_ENTRIES)
+
+response_cache = ResponseCache(_build_backend(), RESPONSE_CACHE_TTL_SECONDS)
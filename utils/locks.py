@@ -0,0 +1,31 @@
+import hashlib
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+def _lock_key(name: str) -> int:
+    """Stable signed 64-bit key for a lock name, the same in every worker"""
+    return int.from_bytes(hashlib.sha1(name.encode()).digest()[:8], "big", signed=True)
+
+def advisory_xact_lock(db: Session, name: str, wait: bool = True) -> bool:
+    """Take a PostgreSQL advisory lock held until the session's transaction ends.
+
+    With wait=False returns False instead of blocking when another transaction
+    holds it. Other databases have no advisory locks and always get True, SQLite
+    serializes writers on its own.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    if wait:
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _lock_key(name)})
+        return True
+    return bool(db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _lock_key(name)}).scalar())
+
+def share_table_lock(db: Session, *tables: str):
+    """LOCK TABLE ... IN SHARE MODE until the session's transaction ends.
+
+    Waits for the transactions already writing to the tables and holds off new
+    writers until this one ends. A no-op outside PostgreSQL, like advisory_xact_lock.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    db.execute(text(f"LOCK TABLE {', '.join(tables)} IN SHARE MODE"))
@@ -0,0 +1,15 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+def attach_related(db: Session, obj, **related):
+    """Populate many-to-one relationships of a freshly written row for the response.
+
+    Each keyword maps a relationship name to a (model, primary key) pair. The
+    related objects are taken from the identity map when they were loaded
+    earlier in the request and only fall back to a primary key lookup.
+    """
+    for name, (model, pk) in related.items():
+        # Session.get answers from the identity map without a query when it can
+        value = db.get(model, pk) if pk is not None else None
+        set_committed_value(obj, name, value)
+    return obj
@@ -0,0 +1,44 @@
+import base64
+import json
+from datetime import date
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(sort_value: date, row_id: int) -> str:
+    """Encode the (sort value, id) of the last row of a page as an opaque cursor"""
+    payload = json.dumps([sort_value.isoformat(), row_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return date.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def apply_keyset(stmt, sort_column, id_column, cursor: Optional[str], limit: int):
+    """Order newest first on (sort_column, id) and seek past the cursor.
+
+    One extra row is fetched so build_page can tell whether another page exists.
+    """
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        # The plain bound is implied by the row comparison but lets PostgreSQL prune partitions
+        stmt = stmt.where(sort_column <= sort_value, tuple_(sort_column, id_column) < tuple_(sort_value, last_id))
+    return stmt.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+
+def build_page(rows, limit: int, sort_attr: str):
+    rows = list(rows)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_attr), last.id)
+    return {"items": rows, "next_cursor": next_cursor}
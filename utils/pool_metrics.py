@@ -0,0 +1,81 @@
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds in seconds of the checkout latency histogram buckets
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class PoolMetrics:
+    """Checkout latency histogram and timeout counter for one engine's pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bucket_counts = [0] * len(CHECKOUT_BUCKETS)
+        self.checkout_count = 0
+        self.checkout_seconds = 0.0
+        self.max_checkout_seconds = 0.0
+        self.timeouts = 0
+
+    def observe_checkout(self, seconds: float):
+        with self._lock:
+            self.checkout_count += 1
+            self.checkout_seconds += seconds
+            self.max_checkout_seconds = max(self.max_checkout_seconds, seconds)
+            for idx, upper in enumerate(CHECKOUT_BUCKETS):
+                if seconds <= upper:
+                    self.bucket_counts[idx] += 1
+                    break
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            histogram = {}
+            cumulative = 0
+            for upper, count in zip(CHECKOUT_BUCKETS, self.bucket_counts):
+                cumulative += count
+                histogram[str(upper)] = cumulative
+            histogram["+Inf"] = self.checkout_count
+            stats = {
+                "checkouts": self.checkout_count,
+                "checkout_seconds_total": self.checkout_seconds,
+                "checkout_seconds_max": self.max_checkout_seconds,
+                "checkout_seconds_histogram": histogram,
+                "timeouts": self.timeouts,
+            }
+
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "timeout": pool.timeout(),
+            })
+        return stats
+
+sync_pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+class _InstrumentedPoolMixin:
+    """Times how long callers wait for a connection from the queue"""
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.observe_checkout(time.perf_counter() - start)
+        return connection
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    metrics = sync_pool_metrics
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    metrics = async_pool_metrics
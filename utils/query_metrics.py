@@ -0,0 +1,190 @@
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+# Statements kept per request for the slow request log
+SLOW_REQUEST_MAX_STATEMENTS = int(os.getenv("SLOW_REQUEST_MAX_STATEMENTS", "50"))
+
+# Upper bounds in seconds of the request duration histogram buckets
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class RequestQueryStats:
+    """Queries issued while serving one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements = []  # (seconds, statement), capped at SLOW_REQUEST_MAX_STATEMENTS
+
+    def observe(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+        if len(self.statements) < SLOW_REQUEST_MAX_STATEMENTS:
+            self.statements.append((seconds, statement))
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries", '
+                f'db-slowest;dur={self.slowest_seconds * 1000:.1f}, '
+                f'app;dur={total_seconds * 1000:.1f}')
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+def instrument_engine(engine):
+    """Time every statement of a sync engine (use async_engine.sync_engine for async)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append((context, time.perf_counter()))
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _observe(statement, conn.info["query_start"].pop()[1])
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # A failed statement never reaches after_cursor_execute. Only its own entry
+        # is popped, errors outside a statement (connect, commit, fetch) pushed none
+        if exception_context.connection is None:
+            return
+        starts = exception_context.connection.info.get("query_start")
+        if starts and starts[-1][0] is exception_context.execution_context:
+            _observe(exception_context.statement, starts.pop()[1])
+
+def _observe(statement: str, started: float):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.observe(statement, time.perf_counter() - started)
+
+class RouteMetrics:
+    """Per route request and query totals in Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float, stats: RequestQueryStats):
+        with self._lock:
+            entry = self._routes.get((method, route))
+            if entry is None:
+                entry = self._routes[(method, route)] = {
+                    "requests": 0,
+                    "errors": 0,
+                    "seconds": 0.0,
+                    "buckets": [0] * len(REQUEST_BUCKETS),
+                    "queries": 0,
+                    "db_seconds": 0.0,
+                    "max_queries": 0,
+                }
+            entry["requests"] += 1
+            entry["errors"] += status_code >= 500
+            entry["seconds"] += seconds
+            for idx, upper in enumerate(REQUEST_BUCKETS):
+                if seconds <= upper:
+                    entry["buckets"][idx] += 1
+                    break
+            entry["queries"] += stats.count
+            entry["db_seconds"] += stats.seconds
+            entry["max_queries"] = max(entry["max_queries"], stats.count)
+
+    def render(self) -> str:
+        with self._lock:
+            # Copy under the lock, formatting happens outside it
+            routes = sorted((key, dict(entry, buckets=list(entry["buckets"]))) for key, entry in self._routes.items())
+
+        def family(name: str, kind: str, help_text: str, samples):
+            return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"] + list(samples)
+
+        def labels(method: str, route: str, le: Optional[str] = None) -> str:
+            bucket = f',le="{le}"' if le is not None else ""
+            return f'{{method="{method}",route="{route}"{bucket}}}'
+
+        def histogram_samples():
+            for (method, route), entry in routes:
+                cumulative = 0
+                for upper, count in zip(REQUEST_BUCKETS, entry["buckets"]):
+                    cumulative += count
+                    yield f"bakery_http_request_duration_seconds_bucket{labels(method, route, str(upper))} {cumulative}"
+                yield f"bakery_http_request_duration_seconds_bucket{labels(method, route, '+Inf')} {entry['requests']}"
+                yield f"bakery_http_request_duration_seconds_sum{labels(method, route)} {entry['seconds']}"
+                yield f"bakery_http_request_duration_seconds_count{labels(method, route)} {entry['requests']}"
+
+        def simple(name: str, field: str):
+            return (f"{name}{labels(method, route)} {entry[field]}" for (method, route), entry in routes)
+
+        lines = []
+        lines += family("bakery_http_requests_total", "counter", "Requests served per route",
+                        simple("bakery_http_requests_total", "requests"))
+        lines += family("bakery_http_request_errors_total", "counter", "Requests per route that ended in a 5xx",
+                        simple("bakery_http_request_errors_total", "errors"))
+        lines += family("bakery_http_request_duration_seconds", "histogram", "Request duration per route",
+                        histogram_samples())
+        lines += family("bakery_db_queries_total", "counter", "SQL statements issued per route",
+                        simple("bakery_db_queries_total", "queries"))
+        lines += family("bakery_db_query_duration_seconds_total", "counter", "Time spent in SQL statements per route",
+                        simple("bakery_db_query_duration_seconds_total", "db_seconds"))
+        lines += family("bakery_db_queries_per_request_max", "gauge", "Most SQL statements seen in one request per route",
+                        simple("bakery_db_queries_per_request_max", "max_queries"))
+        return "\n".join(lines) + "\n"
+
+route_metrics = RouteMetrics()
+
+class QueryMetricsMiddleware:
+    """Collects the queries of each request into Server-Timing, route metrics and the slow log.
+
+    Written as plain ASGI middleware so the stats context is the one the
+    endpoint (and the threadpool running sync endpoints) inherits.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing(time.perf_counter() - start).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            seconds = time.perf_counter() - start
+            # The router stores the matched route in the scope, unmatched paths share one label
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            route_metrics.observe(scope["method"], route_path, status_code, seconds, stats)
+            if seconds * 1000 >= SLOW_REQUEST_MS:
+                _log_slow_request(scope, route_path, status_code, seconds, stats)
+
+def _log_slow_request(scope, route_path: str, status_code: int, seconds: float, stats: RequestQueryStats):
+    statements = "\n".join(f"  {query_seconds * 1000:8.1f} ms  {statement}" for query_seconds, statement in stats.statements)
+    logger.warning(
+        "Slow request %s %s (%s) status=%s %.1f ms, %d queries in %.1f ms\n%s",
+        scope["method"], scope["path"], route_path, status_code,
+        seconds * 1000, stats.count, stats.seconds * 1000, statements
+    )